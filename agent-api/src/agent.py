@@ -1,78 +1,188 @@
-import json
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
 from anthropic import AsyncAnthropic
-from .mcp_client import mcp_client
+from .mcp_client import error_payload, is_error, mcp_client
 from .tools_schemas import tools_schemas
 from .memory import memory
+from .tool_cache import tool_cache
+from .context import ContextWindow
+from .usage import add_usage, empty_usage, usage_tracker, usage_fields
+from .observability import agent_iterations, anthropic_seconds, anthropic_tokens, tool_call_seconds
+
+logger = logging.getLogger(__name__)
 
 
 class Agent:
     """
     It takes  the user messages and sends it to Claude with the available tools.
     It then executes tool calls via MCP server and teturns the final response.
+    Tool calls requested in the same turn run concurrently, up to tool_concurrency at a time.
+    Responses are streamed: text deltas and tool calls are reported as events while the loop runs.
+    The tools, the system prompt and the conversation so far are marked for prompt caching, so every
+    iteration of the tool loop (and the next question) only pays full price for what is new.
     """
+    system_prompt = "You are a Pokemon assistant fetching information from 4 different endpoints, which narrow the " \
+        "data you have available. You need to remind the user about it, if it asks different stuff." \
+        "The following endpoints are: " \
+        "- pokemon/{name} - Pokemon data" \
+        "- move/{name} - moves data" \
+        "- type/{name} - type effectiveness data" \
+        "- ability/{name} - ability descriptions data" \
+        "- pokemon - list of all Pokemons. " \
+        "Do not answer questions unrelated to Pokemon. " \
+        "Reply to the user briefly with only the information required. Nothing else."
+
     def __init__(self, api_key: str):
         self.client = AsyncAnthropic(api_key=api_key)
         self.model = "claude-sonnet-4-20250514"
-    
-    async def process_query(self, conversation_id: str, user_message: str) -> str:
+        self.tool_concurrency = int(os.getenv("tool_concurrency", 4))
+        # Seconds a single tool call may take before its result is replaced by an error
+        self.tool_timeout = float(os.getenv("tool_timeout", 15))
+        # Only this many (estimated) tokens of the conversation are sent to Claude on each call
+        self.context = ContextWindow(max_tokens=int(os.getenv("context_max_tokens", 8000)))
+        # Tools come before the system prompt in the prompt, so this one breakpoint caches both
+        self.system = [{"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+    def _cache_window(self, window: list) -> list:
+        """
+        It returns a copy of the window with a cache breakpoint on its last block, so the whole conversation
+        prefix is cached and read back on the next call. The stored messages are not modified.
+        """
+        if not window:
+            return window
+        last = window[-1]
+        content = last["content"]
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = list(content)
+        blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+        return window[:-1] + [{**last, "content": blocks}]
+
+    async def _call_tool(self, tool_use, semaphore: asyncio.Semaphore) -> dict:
         """
-        It returns the assistant's text response.
+        It calls one tool on the MCP server, unless its result is cached, and returns its tool_result block.
+        A tool that times out or fails (connection error, MCP server error) gives an error tool_result,
+        so Claude can go on with the other results instead of the whole request failing.
         """
-        messages = memory.get_messages(conversation_id)
+        start = time.perf_counter()
+        result = await tool_cache.get(tool_use.name, tool_use.input)
+        source = "cache"
+        if result is None:
+            source = "mcp"
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(mcp_client.call_tool(tool_use.name, tool_use.input), self.tool_timeout)
+                except asyncio.TimeoutError:
+                    result = error_payload(f"Tool {tool_use.name} timed out after {self.tool_timeout} seconds")
+                except Exception as e:
+                    logger.warning("Tool call failed", extra={"tool": tool_use.name, "error": str(e)})
+                    result = error_payload(f"Tool {tool_use.name} failed: {e}")
+            await tool_cache.set(tool_use.name, tool_use.input, result)
+        seconds = time.perf_counter() - start
+        outcome = "error" if is_error(result) else "ok"
+        tool_call_seconds.labels(tool_use.name, source, outcome).observe(seconds)
+        logger.info("Tool called", extra={"tool": tool_use.name, "arguments": tool_use.input, "source": source,
+                                          "outcome": outcome, "seconds": round(seconds, 4)})
+        logger.debug("Tool result", extra={"tool": tool_use.name, "result": result})
+
+        # The JSON text of the tool goes to Claude as it came from the MCP server
+        block = {"type": "tool_result", "tool_use_id": tool_use.id, "content": result}
+        if outcome == "error":
+            block["is_error"] = True
+        return block
+
+    async def _run_tools(self, tool_uses: list) -> AsyncIterator[dict]:
+        """
+        It runs all the tool calls of a turn concurrently and yields each result as soon as it is ready.
+        Calls still running when the caller stops iterating (e.g. the client disconnected) are cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.tool_concurrency)
+        tasks = [asyncio.create_task(self._call_tool(tool_use, semaphore)) for tool_use in tool_uses]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_query(self, conversation_id: str, user_message: str) -> AsyncIterator[dict]:
+        """
+        It runs the tool loop and yields events as they happen:
+        "text" for each text delta, "tool_start" and "tool_end" around every tool call and a final "done"
+        with the last response text, how many context tokens were not sent thanks to compaction and the
+        tokens used by all the Claude calls of the request.
+        The conversation is saved to memory after every turn.
+        """
+        messages = await memory.get_messages(conversation_id)
+        # Only the messages after this index are new and still have to be stored
+        saved = len(messages)
         messages.append({"role": "user", "content": user_message})
+        tokens_saved = 0
+        usage = empty_usage()
+        calls = 0
 
         while True:
-            
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                system="You are a Pokemon assistant fetching information from 4 different endpoints, which narrow the " \
-                "data you have available. You need to remind the user about it, if it asks different stuff." \
-                "The following endpoints are: " \
-                "- pokemon/{name} - Pokemon data" \
-                "- move/{name} - moves data" \
-                "- type/{name} - type effectiveness data" \
-                "- ability/{name} - ability descriptions data" \
-                "- pokemon - list of all Pokemons. " \
-                "Do not answer questions unrelated to Pokemon. " \
-                "Reply to the user briefly with only the information required. Nothing else.",
-                tools=tools_schemas,
-                messages=messages)
-            
-            if response.content[0].type == "text" and len(response.content) == 1:
-                assistant_text = response.content[0].text
+
+            window, saved_now = self.context.fit(messages)
+            tokens_saved += saved_now
+            start = time.perf_counter()
+            async with self.client.messages.stream(model=self.model, max_tokens=1000, system=self.system,
+                                                   tools=tools_schemas, messages=self._cache_window(window)) as stream:
+                async for text in stream.text_stream:
+                    yield {"type": "text", "text": text}
+                response = await stream.get_final_message()
+            anthropic_seconds.observe(time.perf_counter() - start)
+            for field in usage_fields:
+                anthropic_tokens.labels(field).inc(getattr(response.usage, field, None) or 0)
+            add_usage(usage, response.usage)
+            calls += 1
+
+            tool_uses = [content for content in response.content if content.type == "tool_use"]
+            if not tool_uses:
+                assistant_text = "".join(content.text for content in response.content if content.type == "text")
                 assistant_message = {
                     "role": "assistant",
                     "content": assistant_text
                 }
-                memory.save_messages(conversation_id, messages)
-                return assistant_text
-            
+                messages.append(assistant_message)
+                await memory.append_messages(conversation_id, messages[saved:])
+                usage_tracker.record(usage, calls)
+                agent_iterations.observe(calls)
+                logger.info("Request answered", extra={"conversation_id": conversation_id, "iterations": calls,
+                                                       "context_tokens_saved": tokens_saved, **usage})
+                yield {"type": "done", "response": assistant_text, "context_tokens_saved": tokens_saved, "usage": usage}
+                return
+
             assistant_message = {
                 "role": "assistant",
                 "content": response.to_dict()["content"]
             }
             messages.append(assistant_message)
-            
-            for content in response.content:
-                if content.type == "tool_use":
-                    tool_name = content.name
-                    tool_args = content.input
-                    tool_use_id = content.id
-                    
-                    print(f"Calling tool: {tool_name} with args: {tool_args}")
-                    
-                    # Calling the MCP server
-                    result = await mcp_client.call_tool(tool_name, tool_args)
-
-                    print(f"Tool {tool_name} result: {result}")
-                    
-                    messages.append({
-                        "role": "user",
-                        "content": [{
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": json.dumps(result)
-                        }]
-                    })
-            memory.save_messages(conversation_id, messages)
+
+            names = {tool_use.id: tool_use.name for tool_use in tool_uses}
+            for tool_use in tool_uses:
+                yield {"type": "tool_start", "id": tool_use.id, "name": tool_use.name, "input": tool_use.input}
+            results = {}
+            async for result in self._run_tools(tool_uses):
+                results[result["tool_use_id"]] = result
+                yield {"type": "tool_end", "id": result["tool_use_id"], "name": names[result["tool_use_id"]],
+                       "is_error": result.get("is_error", False)}
+
+            # All results of a turn go back to Claude in a single user message, in the original order
+            messages.append({"role": "user", "content": [results[tool_use.id] for tool_use in tool_uses]})
+            await memory.append_messages(conversation_id, messages[saved:])
+            saved = len(messages)
+
+    async def process_query(self, conversation_id: str, user_message: str) -> dict:
+        """
+        It returns the assistant's text response, how many context tokens were not sent thanks to compaction
+        and the token usage of the request.
+        """
+        async for event in self.stream_query(conversation_id, user_message):
+            if event["type"] == "done":
+                return {key: value for key, value in event.items() if key != "type"}
+        raise Exception("The conversation ended without a response")
@@ -0,0 +1,87 @@
+"""
+Bounded conversation context.
+
+Conversations are stored in full, but only a window of them is sent to Claude on every turn.
+ContextWindow keeps that window under a token budget: first it compacts the tool results of older turns,
+then, if that is not enough, it drops the oldest turns entirely, and last it compacts the older tool results
+of the recent turns too (a long tool loop within the current question), only the latest ones stay whole.
+tool_use / tool_result pairs stay valid: compaction only shortens a result and a dropped turn always goes
+from one user question to the next, so every tool_result keeps its tool_use.
+
+Tokens are estimated from characters (about 4 per token), which is enough for a budget.
+"""
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(messages: list) -> int:
+    return sum(len(orjson.dumps(message)) for message in messages) // 4
+
+def _is_question(message: dict) -> bool:
+    """
+    It tells if a message starts a turn, i.e. it is a user message that is not a list of tool results.
+    """
+    if message["role"] != "user":
+        return False
+    content = message["content"]
+    return isinstance(content, str) or not any(block.get("type") == "tool_result" for block in content)
+
+class ContextWindow:
+    """
+    It fits a conversation into max_tokens. The last keep_turns turns are never dropped
+    and older tool results are cut to compact_chars characters.
+    """
+    def __init__(self, max_tokens: int, keep_turns: int = 2, compact_chars: int = 200):
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.compact_chars = compact_chars
+
+    def _compact(self, message: dict) -> dict:
+        """
+        It returns a copy of a message with its long tool results shortened.
+        """
+        if message["role"] != "user" or isinstance(message["content"], str):
+            return message
+        blocks = []
+        for block in message["content"]:
+            content = block.get("content")
+            if block.get("type") == "tool_result" and isinstance(content, str) and len(content) > self.compact_chars:
+                removed = len(content) - self.compact_chars
+                block = {**block, "content": f"{content[:self.compact_chars]}... [compacted, {removed} characters removed]"}
+            blocks.append(block)
+        return {**message, "content": blocks}
+
+    def fit(self, messages: list) -> tuple[list, int]:
+        """
+        It returns the messages to send and how many tokens were saved compared to the full conversation.
+        The stored messages are not modified.
+        """
+        total = estimate_tokens(messages)
+        if total <= self.max_tokens:
+            return messages, 0
+
+        questions = [i for i, message in enumerate(messages) if _is_question(message)]
+        recent = questions[-self.keep_turns] if len(questions) >= self.keep_turns else 0
+        window = [self._compact(message) for message in messages[:recent]] + messages[recent:]
+
+        # Dropping whole turns, oldest first, but never the recent ones
+        starts = [i for i in questions if i < recent]
+        dropped = 0
+        for start in starts[1:] + [recent]:
+            if estimate_tokens(window) <= self.max_tokens:
+                break
+            window = window[start - dropped:]
+            dropped = start
+
+        if estimate_tokens(window) > self.max_tokens:
+            # Still too big within the recent turns: only the results of the latest tool round are kept whole
+            results = [i for i, message in enumerate(window)
+                       if message["role"] == "user" and not _is_question(message)]
+            for i in results[:-1]:
+                window[i] = self._compact(window[i])
+
+        size = estimate_tokens(window)
+        if size > self.max_tokens:
+            logger.warning("Context window over budget", extra={"tokens": size, "max_tokens": self.max_tokens})
+        return window, total - size
@@ -1,18 +1,29 @@
+from dotenv import load_dotenv
+# The .env file is read first, it can set log_level and log_sample_rate
+load_dotenv()
+from .observability import setup_logging
+# Configured before the other modules are imported, they log while creating their clients
+setup_logging()
 from .agent import Agent
 from .mcp_client import mcp_client
+from .memory import memory
+from .tool_cache import tool_cache
+from .usage import usage_tracker
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from dotenv import load_dotenv
+from fastapi.responses import Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+import orjson
 import os
 import uuid
 
-load_dotenv()
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
     yield
     await mcp_client.close()
+    await memory.close()
+    await tool_cache.close()
 
 app = FastAPI(title="Pokemon AIAgent API", lifespan=lifespan)
 api_key = os.getenv("api_key")
@@ -26,6 +37,17 @@ agent = Agent(api_key=api_key)
 async def root():
     return {"status": "Agent running"}
 
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/usage")
+async def usage():
+    """
+    It returns the tokens used since the worker started, including how many were read from the prompt cache.
+    """
+    return usage_tracker.stats()
+
 @app.post("/pokemon_request")
 async def pokemon_request(request: dict):
     """
@@ -33,12 +55,30 @@ async def pokemon_request(request: dict):
     """
     try: 
         conversation_id = request.get("conversation_id") or str(uuid.uuid4())
-        response = await agent.process_query(conversation_id, request["message"])
+        result = await agent.process_query(conversation_id, request["message"])
             
         return {
-            "response": response,
+            **result,
             "conversation_id": conversation_id
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/pokemon_request/stream")
+async def pokemon_request_stream(request: dict):
+    """
+    It sends a message to the LLM and streams the answer as server-sent events:
+    start, text deltas, tool_start / tool_end for each tool call, then done (or error).
+    """
+    conversation_id = request.get("conversation_id") or str(uuid.uuid4())
+
+    async def events():
+        yield b"event: start\ndata: " + orjson.dumps({"conversation_id": conversation_id}) + b"\n\n"
+        try:
+            async for event in agent.stream_query(conversation_id, request["message"]):
+                yield f"event: {event['type']}\ndata: ".encode() + orjson.dumps(event) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,11 +1,38 @@
 """
 It connects to the MCP server and calls the various tools.
+
+MCP sessions are pooled and shared by all the conversations: a tool call borrows an idle session
+(or opens a new one, up to pool_size) and gives it back when done.
+If the server doesn't know a session anymore (e.g. after the MCP server restarted), the session is
+dropped and the call is retried once on a fresh one, so the agent recovers without restarting.
+Responses are read as a stream and the SSE events are parsed as the bytes arrive.
+Tool results are returned as the JSON text the tool produced: it goes to Claude as is, without being
+decoded and encoded again.
 """
+import asyncio
+import itertools
+import logging
 import httpx
+import orjson
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
+logger = logging.getLogger(__name__)
+
+def error_payload(message) -> str:
+    return orjson.dumps({"error": message}).decode()
+
+def is_error(payload: str) -> bool:
+    """
+    It tells if a tool result is an error, i.e. a JSON object starting with an "error" key.
+    """
+    return payload.startswith('{"error"')
+
+class SessionExpired(Exception):
+    """
+    The MCP server rejected the session id.
+    """
 
 class MCPClient:
     """
@@ -15,81 +42,165 @@ class MCPClient:
 
     def __init__(self):
         self.mcp_server_url = os.getenv("mcp_server_url", "http://localhost:8000")
-        print(f"MCP loading url: {self.mcp_server_url}")
+        logger.info("MCP server configured", extra={"url": self.mcp_server_url})
         self.http_client = httpx.AsyncClient(timeout=20.0)
-        self.session_id = None
-    
+        self.pool_size = int(os.getenv("mcp_pool_size", 8))
+        self.idle_sessions: list[str] = []
+        # Sessions currently open, both idle and in use
+        self.open_sessions = 0
+        self.session_available = asyncio.Condition()
+        # JSON-RPC ids must be unique per session, a global counter keeps them unique everywhere
+        self.request_ids = itertools.count(1)
+
     async def close(self):
         """
         it closes the HTTP client.
         """
         await self.http_client.aclose()
-    
-    async def _ensure_session(self):
-        """
-        Initialize session if not exists
-        """
-        if self.session_id:
-            return
-        
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2025-01-01",
-                "capabilities": {},
-                "clientInfo": {"name": "pokemon-agent", "version": "1.0.0"}
-            }
+
+    async def _open_session(self) -> str:
+        """
+        It initializes a new MCP session and returns its id.
+        """
+        init_params = {
+            "protocolVersion": "2025-01-01",
+            "capabilities": {},
+            "clientInfo": {"name": "pokemon-agent", "version": "1.0.0"}
         }
-        
-        headers = {"Accept": "application/json, text/event-stream"}
-        response = await self.http_client.post(f"{self.mcp_server_url}/mcp", json=init_request, headers=headers)
-        
-        self.session_id = response.headers.get("mcp-session-id")
-        print(f"MCP Session Id: {self.session_id}")
-
-        if not self.session_id:
-            print(f"Session init failed. Status: {response.status_code}")
-            print(f"Response: {response.text[:500]}")
+        response, _ = await self._post({"jsonrpc": "2.0", "id": next(self.request_ids),
+                                        "method": "initialize", "params": init_params})
+        session_id = response.headers.get("mcp-session-id")
+        if not session_id:
+            logger.error("MCP session init failed", extra={"status": response.status_code})
             raise Exception("Failed to initialize MCP session")
-    
-    async def call_tool(self, tool_name: str, arguments: dict) -> dict: # type: ignore
+
+        await self._post({"jsonrpc": "2.0", "method": "notifications/initialized"}, session_id)
+        logger.info("MCP session opened", extra={"session_id": session_id})
+        return session_id
+
+    async def _acquire_session(self) -> str:
         """
-        Ths function calls a tool on the MCP server. 
-        If there is an errror it returns it instead. 
+        It returns an idle session, opens a new one if the pool is not full, or waits for one to be released.
         """
-        await self._ensure_session()
+        async with self.session_available:
+            while not self.idle_sessions and self.open_sessions >= self.pool_size:
+                await self.session_available.wait()
+            if self.idle_sessions:
+                return self.idle_sessions.pop()
+            self.open_sessions += 1
+
+        try:
+            return await self._open_session()
+        except BaseException:
+            # Cancellation included (e.g. the tool timeout fired during initialize), otherwise the slot is lost for good
+            await self._release_session(None)
+            raise
 
+    async def _release_session(self, session_id: str | None) -> None:
+        """
+        It puts a session back in the pool. None means the session is broken and is dropped.
+        """
+        async with self.session_available:
+            if session_id:
+                self.idle_sessions.append(session_id)
+            else:
+                self.open_sessions -= 1
+            self.session_available.notify()
+
+    async def _drop_idle_sessions(self) -> None:
+        """
+        It forgets all idle sessions. An expired session usually means the server restarted,
+        so the other sessions opened before are gone as well.
+        """
+        async with self.session_available:
+            self.open_sessions -= len(self.idle_sessions)
+            self.idle_sessions = []
+            self.session_available.notify_all()
+
+    async def _post(self, message: dict, session_id: str | None = None) -> tuple[httpx.Response, dict | None]:
+        """
+        It sends a JSON-RPC message and returns the HTTP response with the reply to the message,
+        which may come back as plain JSON or as a stream of SSE events.
+        Notifications have no reply, so None is returned for them.
+        """
+        headers = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+        if session_id:
+            headers["Mcp-Session-Id"] = session_id
+
+        async with self.http_client.stream("POST", f"{self.mcp_server_url}/mcp", content=orjson.dumps(message),
+                                      headers=headers) as response:
+            if response.status_code >= 400:
+                body = (await response.aread()).decode(errors="replace")
+                if session_id and (response.status_code == 404 or "session" in body.lower()):
+                    raise SessionExpired(body[:200])
+                raise Exception(f"MCP error {response.status_code}: {body[:500]}")
+
+            if "id" not in message:
+                return response, None
+            if response.headers.get("content-type", "").startswith("application/json"):
+                return response, orjson.loads(await response.aread())
+            async for reply in self._sse_messages(response):
+                if reply.get("id") == message["id"]:
+                    return response, reply
+
+        return response, None
+
+    async def _sse_messages(self, response: httpx.Response):
+        """
+        It yields the JSON messages of an SSE stream as soon as each event is complete.
+        """
+        data_lines: list[str] = []
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            elif not line and data_lines:
+                yield orjson.loads("\n".join(data_lines))
+                data_lines = []
+        if data_lines:
+            yield orjson.loads("\n".join(data_lines))
+
+    async def call_tool(self, tool_name: str, arguments: dict) -> str: # type: ignore
+        """
+        Ths function calls a tool on the MCP server and returns its JSON result as text.
+        If there is an errror it returns it instead, as {"error": ...}.
+        """
         request = {"jsonrpc": "2.0",
-                   "id": 1,
                    "method": "tools/call",
                    "params": {"name": tool_name,
                               "arguments": arguments
                               }
                     }
-        headers = {
-            "Accept": "application/json, text/event-stream",
-            "Mcp-Session-Id": self.session_id
-        }
-        
-        response = await self.http_client.post(f"{self.mcp_server_url}/mcp", json=request, headers=headers)
-        import json
-        text = response.text
-
-        for line in text.split("\n"):
-            if line.startswith("data: "):
-                data = json.loads(line[6:])
-                if "error" in data:
-                    return {"error": data["error"]}
-
-                result = data.get("result", {})
-                if "content" in result and len(result["content"]) > 0:
-                    content = result["content"][0]
-                    if content.get("type") == "text":
-                        return json.loads(content["text"])
-                return result
-    
-        return {"error": "No valid response"}
-    
-mcp_client = MCPClient()
\ No newline at end of file
+
+        for attempt in range(2):
+            session_id = await self._acquire_session()
+            try:
+                _, data = await self._post({**request, "id": next(self.request_ids)}, session_id)
+                break
+            except SessionExpired:
+                logger.warning("MCP session expired, reinitializing", extra={"session_id": session_id})
+                session_id = None
+                await self._drop_idle_sessions()
+                if attempt == 1:
+                    return error_payload("MCP session could not be recovered")
+            except Exception:
+                session_id = None
+                raise
+            finally:
+                await self._release_session(session_id)
+
+        if data is None:
+            return error_payload("No valid response")
+        if "error" in data:
+            return error_payload(data["error"])
+
+        result = data.get("result", {})
+        if "content" in result and len(result["content"]) > 0:
+            content = result["content"][0]
+            if content.get("type") == "text":
+                # Failed tool executions come back as plain text instead of JSON
+                if result.get("isError"):
+                    return error_payload(content["text"])
+                return content["text"]
+        return orjson.dumps(result).decode()
+
+mcp_client = MCPClient()
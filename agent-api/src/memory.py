@@ -1,49 +1,127 @@
-import json
+"""
+Conversation memory.
+
+Each conversation is a Redis list holding one JSON message per item, so saving a turn only appends
+the new messages instead of rewriting the whole conversation, and renewing the expiry is a single command
+sent in the same round trip. The asyncio Redis client with a connection pool never blocks the event loop.
+
+With memory_backend=local the conversations are kept in process instead (tests and local runs without Redis).
+"""
+import logging
 import os
-import redis
+import time
+import orjson
+import redis.asyncio as redis
 from dotenv import load_dotenv
+from .observability import redis_seconds, timed
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
-class ConversationMemory:
-    
-    def __init__(self):
+def create_redis() -> redis.Redis:
+    """
+    It creates an asyncio Redis client with a connection pool, configured from the environment.
+    """
+    redis_host = os.getenv("redis_host", "localhost")
+    redis_port = int(os.getenv("redis_port", 6379))
+    redis_password = os.getenv("redis_password", None)
+
+    logger.info("Redis configured", extra={"host": redis_host, "port": redis_port})
+
+    pool = redis.ConnectionPool(host=redis_host, port=redis_port, password=redis_password, decode_responses=True,
+                                max_connections=int(os.getenv("redis_max_connections", 50)))
+    return redis.Redis(connection_pool=pool)
+
+class RedisConversationStore:
+    """
+    Conversations stored as Redis lists.
+    """
+    def __init__(self, ttl: int):
+        self.redis = create_redis()
+        self.ttl = ttl
+
+    async def get(self, key: str) -> list:
+        with timed(redis_seconds, "lrange"):
+            items = await self.redis.lrange(key, 0, -1)
+        return [orjson.loads(item) for item in items]
+
+    async def append(self, key: str, messages: list) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, *[orjson.dumps(message) for message in messages])
+            pipe.expire(key, self.ttl)
+            with timed(redis_seconds, "rpush_expire"):
+                await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        with timed(redis_seconds, "delete"):
+            await self.redis.delete(key)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+class LocalConversationStore:
+    """
+    Conversations stored in process, with the same interface and expiry as the Redis store.
+    """
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.conversations: dict[str, tuple[list, float]] = {}
+
+    def _live(self, key: str) -> list:
+        messages, expires_at = self.conversations.get(key, ([], 0.0))
+        if expires_at < time.monotonic():
+            self.conversations.pop(key, None)
+            return []
+        return messages
+
+    async def get(self, key: str) -> list:
+        # Copying like a real store would, so callers can't change the stored messages
+        return orjson.loads(orjson.dumps(self._live(key)))
 
-        redis_host = os.getenv("redis_host", "localhost")
-        redis_port = int(os.getenv("redis_port", 6379))
-        redis_password = os.getenv("redis_password", None)
+    async def append(self, key: str, messages: list) -> None:
+        stored = self._live(key)
+        stored.extend(orjson.loads(orjson.dumps(messages)))
+        self.conversations[key] = (stored, time.monotonic() + self.ttl)
 
-        print(f"Redis host: {redis_host}")
-        print(f"Redis port: {redis_port}")
+    async def delete(self, key: str) -> None:
+        self.conversations.pop(key, None)
 
-        self.redis = redis.Redis(host=redis_host, port=redis_port, password=redis_password, decode_responses=True)
+    async def close(self) -> None:
+        self.conversations.clear()
+
+class ConversationMemory:
+
+    def __init__(self):
 
         # Conversations expiring after 24 hours
         self.ttl = 60 * 60 * 24
-    
+
+        if os.getenv("memory_backend", "redis") == "local":
+            self.store = LocalConversationStore(self.ttl)
+        else:
+            self.store = RedisConversationStore(self.ttl)
+
     def _make_key(self, conversation_id: str) -> str:
-        
-        return f"conv:{conversation_id}"
-    
-    def get_messages(self, conversation_id: str) -> list:
-
-        key = self._make_key(conversation_id)
-        data = self.redis.get(key)
-        
-        if data is None:
-            return []
 
-        return json.loads(data) # type: ignore
+        return f"conversation:{conversation_id}"
+
+    async def get_messages(self, conversation_id: str) -> list:
+
+        return await self.store.get(self._make_key(conversation_id))
+
+    async def append_messages(self, conversation_id: str, messages: list) -> None:
+        """
+        It adds new messages at the end of the conversation and renews its expiry.
+        """
+        if messages:
+            await self.store.append(self._make_key(conversation_id), messages)
+
+    async def delete_conversation(self, conversation_id: str) -> None:
 
-    def save_messages(self, conversation_id: str, messages: list) -> None:
+        await self.store.delete(self._make_key(conversation_id))
 
-        key = self._make_key(conversation_id)
-        data = json.dumps(messages)
-        self.redis.set(key, data, ex=self.ttl)
-    
-    def delete_conversation(self, conversation_id: str) -> None:
+    async def close(self) -> None:
 
-        key = self._make_key(conversation_id)
-        self.redis.delete(key)
+        await self.store.close()
 
-memory = ConversationMemory()
\ No newline at end of file
+memory = ConversationMemory()
@@ -0,0 +1,73 @@
+"""
+Metrics and logs.
+
+Prometheus metrics are exposed on /metrics: tool call latency (from the tool cache or the MCP server),
+iterations of the agent loop, Anthropic latency and token usage, and Redis command latency.
+Logs are JSON lines with the fields passed as extra, and routine (below WARNING) logs can be sampled
+with log_sample_rate to keep their volume down under load.
+"""
+import json
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Histogram
+
+tool_call_seconds = Histogram("agent_tool_call_seconds", "Latency of the tool calls", ["tool", "source", "outcome"])
+agent_iterations = Histogram("agent_loop_iterations", "Claude calls needed to answer a request",
+                             buckets=(1, 2, 3, 4, 5, 6, 8, 10))
+anthropic_seconds = Histogram("agent_anthropic_seconds", "Latency of the Claude calls, until the full response")
+anthropic_tokens = Counter("agent_anthropic_tokens", "Tokens used by the Claude calls", ["kind"])
+redis_seconds = Histogram("agent_redis_seconds", "Latency of the Redis commands", ["operation"],
+                          buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1))
+
+@contextmanager
+def timed(histogram: Histogram, *labels: str):
+    """
+    It observes how long the block took.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        (histogram.labels(*labels) if labels else histogram).observe(time.perf_counter() - start)
+
+# Attributes every log record has, everything else was passed as extra
+_record_fields = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with the extra fields of the record.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                 "message": record.getMessage()}
+        entry.update({key: value for key, value in vars(record).items() if key not in _record_fields})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    It keeps only a share of the records below WARNING. Warnings and errors are always kept.
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+def setup_logging() -> None:
+    """
+    It sends all logs to stderr as sampled JSON lines. Configured with log_level and log_sample_rate.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(SamplingFilter(float(os.getenv("log_sample_rate", 1.0))))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(os.getenv("log_level", "INFO").upper())
+    # httpx logs every request at INFO, that is what the metrics are for
+    logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -0,0 +1,142 @@
+"""
+Tool result cache.
+
+Identical tool calls (get_type("electric") asked in thousands of conversations) are answered here,
+before going to the MCP server, which saves the HTTP hop, the MCP request parsing and the SSE framing.
+Results are keyed by tool name plus the normalized arguments, so "Pikachu " and "pikachu" share an entry.
+Errors are never cached, neither are batch results where some of the items failed (a temporary upstream
+outage would otherwise be served for an hour). Results are kept as the JSON text returned by the tool.
+
+With tool_cache_backend=redis the cache is shared by all the agent workers; the default (local)
+keeps an LRU in process, bounded by tool_cache_max_entries.
+"""
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+import orjson
+from .mcp_client import is_error
+from .memory import create_redis
+from .observability import redis_seconds, timed
+
+logger = logging.getLogger(__name__)
+
+def has_error(value: str) -> bool:
+    """
+    It tells if a tool result is an error or contains one, e.g. a failed item of a batch tool.
+    The results are compact JSON, so an "error" key is always written as "error": (quotes in text are escaped).
+    """
+    return is_error(value) or '"error":' in value
+
+def _normalize(value):
+    """
+    It lowercases and strips strings, also inside lists and dicts, the same way the MCP tools do.
+    """
+    if isinstance(value, str):
+        return value.lower().strip()
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    return value
+
+def make_key(tool_name: str, arguments: dict) -> str:
+    digest = hashlib.sha1(orjson.dumps(_normalize(arguments), option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f"tool:{tool_name}:{digest}"
+
+class LocalToolCache:
+    """
+    In-process LRU with per entry expiry.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self.entries[key] = (value, time.monotonic() + ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def close(self) -> None:
+        self.entries.clear()
+
+class RedisToolCache:
+    """
+    Entries stored as Redis strings expiring on their own; the overall size is left to the Redis eviction policy.
+    """
+    def __init__(self):
+        self.redis = create_redis()
+
+    async def get(self, key: str) -> str | None:
+        with timed(redis_seconds, "get"):
+            return await self.redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        with timed(redis_seconds, "set"):
+            await self.redis.set(key, value, ex=ttl)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+class ToolResultCache:
+
+    # Seconds a result stays valid; the Pokemon data barely changes, listings are kept shorter
+    default_ttl = 60 * 60
+    ttls = {
+        "list_pokemon": 10 * 60,
+    }
+    # Results bigger than this are not worth the memory (or the Redis round trip)
+    max_value_bytes = 64 * 1024
+
+    def __init__(self):
+        self.enabled = os.getenv("tool_cache_backend", "local") != "off"
+        if os.getenv("tool_cache_backend", "local") == "redis":
+            self.store = RedisToolCache()
+        else:
+            self.store = LocalToolCache(int(os.getenv("tool_cache_max_entries", 5000)))
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, tool_name: str, arguments: dict) -> str | None:
+        """
+        It returns the cached result of a tool call, or None.
+        A failing cache is treated as a miss, the tool is then called as usual.
+        """
+        if not self.enabled:
+            return None
+        try:
+            value = await self.store.get(make_key(tool_name, arguments))
+        except Exception as e:
+            logger.warning("Tool cache read failed", extra={"error": str(e)})
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, tool_name: str, arguments: dict, value: str) -> None:
+        if not self.enabled or has_error(value) or len(value) > self.max_value_bytes:
+            return
+        try:
+            await self.store.set(make_key(tool_name, arguments), value, self.ttls.get(tool_name, self.default_ttl))
+        except Exception as e:
+            logger.warning("Tool cache write failed", extra={"error": str(e)})
+
+    async def close(self) -> None:
+        await self.store.close()
+
+tool_cache = ToolResultCache()
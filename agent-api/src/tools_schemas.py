@@ -73,16 +73,169 @@ tools_schemas: list[ToolParam] = [
     },
     {
         "name": "list_pokemon",
-        "description": "Get a list of Pokemon names.",
+        "description": "Get a list of Pokemon names from the full Pokedex, in id order, optionally filtered by name prefix or id range. Returns the number of matches and the next_offset to continue.",
         "input_schema": {
             "type": "object",
             "properties": {
                 "limit": {
                     "type": "integer",
-                    "description": "How many Pokemon to return (default 20)"
+                    "maximum": 2000,
+                    "description": "How many Pokemon to return (default 20, at most 2000)"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "How many matching Pokemon to skip (default 0)"
+                },
+                "prefix": {
+                    "type": "string",
+                    "description": "Only names starting with this, e.g. 'char'"
+                },
+                "min_id": {
+                    "type": "integer",
+                    "description": "Lowest Pokedex id, e.g. 152 for the second generation"
+                },
+                "max_id": {
+                    "type": "integer",
+                    "description": "Highest Pokedex id, e.g. 251"
                 }
             },
             "required": []
         }
+    },
+    {
+        "name": "get_pokemon_batch",
+        "description": "Get basic info about several Pokemon at once (up to 20), e.g. a whole team. Prefer it over repeated get_pokemon calls.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "maxItems": 20,
+                    "description": "Pokemon names, e.g. ['pikachu', 'charizard']"
+                }
+            },
+            "required": ["names"]
+        }
+    },
+    {
+        "name": "get_move_batch",
+        "description": "Get details about several moves at once (up to 20), e.g. to compare them. Prefer it over repeated get_move calls.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "maxItems": 20,
+                    "description": "Move names, e.g. ['thunderbolt', 'fire-blast']"
+                }
+            },
+            "required": ["names"]
+        }
+    },
+    {
+        "name": "get_ability_batch",
+        "description": "Get information about several abilities at once (up to 20). Prefer it over repeated get_ability calls.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "maxItems": 20,
+                    "description": "Ability names, e.g. ['static', 'levitate']"
+                }
+            },
+            "required": ["names"]
+        }
+    },
+    {
+        "name": "get_matchup",
+        "description": "Get damage multipliers of attacking types against defenders, including dual-type defenders, in one call. Prefer it over get_type for effectiveness questions.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "attacking_types": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 1,
+                    "description": "Attacking move types, e.g. ['electric', 'ice']"
+                },
+                "defending_types": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 1,
+                    "description": "Defenders, one entry each, dual types joined by '/', e.g. ['water/flying', 'dragon']"
+                }
+            },
+            "required": ["attacking_types", "defending_types"]
+        }
+    },
+    {
+        "name": "get_move_learners",
+        "description": "Get the Pokemon that can learn a move, paginated.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Move name, e.g. 'thunderbolt'"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "How many Pokemon to return (default 50, max 200)"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "How many Pokemon to skip (default 0)"
+                }
+            },
+            "required": ["name"]
+        }
+    },
+    {
+        "name": "get_ability_pokemon",
+        "description": "Get all the Pokemon that can have an ability, paginated.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Ability name, e.g. 'levitate'"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "How many Pokemon to return (default 50, max 200)"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "How many Pokemon to skip (default 0)"
+                }
+            },
+            "required": ["name"]
+        }
+    },
+    {
+        "name": "get_type_pokemon",
+        "description": "Get all the Pokemon of a type, paginated.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Type name, e.g. 'ghost'"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "How many Pokemon to return (default 50, max 200)"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "How many Pokemon to skip (default 0)"
+                }
+            },
+            "required": ["name"]
+        }
     }
 ]
\ No newline at end of file
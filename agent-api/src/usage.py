@@ -0,0 +1,50 @@
+"""
+Token usage accounting.
+
+Every Claude call of a request reports its input, cache write, cache read and output tokens.
+They are summed per request (returned with the response) and over the lifetime of the worker (GET /usage),
+which shows how much of the input is served from the prompt cache.
+"""
+import time
+
+usage_fields = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
+def empty_usage() -> dict:
+    return {field: 0 for field in usage_fields}
+
+def add_usage(total: dict, usage) -> dict:
+    """
+    It adds the usage of one Claude response to a running total. Missing counters count as 0.
+    """
+    for field in usage_fields:
+        total[field] += getattr(usage, field, None) or 0
+    return total
+
+class UsageTracker:
+    """
+    Usage summed over all the requests served since the worker started.
+    """
+    def __init__(self):
+        self.started_at = time.time()
+        self.requests = 0
+        self.calls = 0
+        self.totals = empty_usage()
+
+    def record(self, usage: dict, calls: int) -> None:
+        self.requests += 1
+        self.calls += calls
+        for field in usage_fields:
+            self.totals[field] += usage[field]
+
+    def stats(self) -> dict:
+        cached = self.totals["cache_read_input_tokens"]
+        prompt = cached + self.totals["cache_creation_input_tokens"] + self.totals["input_tokens"]
+        return {
+            "since": self.started_at,
+            "requests": self.requests,
+            "claude_calls": self.calls,
+            **self.totals,
+            "cache_read_ratio": round(cached / prompt, 3) if prompt else 0.0,
+        }
+
+usage_tracker = UsageTracker()
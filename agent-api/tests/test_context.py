@@ -0,0 +1,91 @@
+import asyncio
+import sys
+from pathlib import Path
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+sys.path.insert(0, str(file_path ))
+
+from src.context import ContextWindow, estimate_tokens
+from src.memory import LocalConversationStore
+
+def tool_round(round_id: str, results: int, size: int) -> list:
+    """
+    One iteration of the tool loop: Claude asks for some tools and gets their results.
+    """
+    uses = [{"type": "tool_use", "id": f"{round_id}-{i}", "name": "get_pokemon", "input": {"name": "pikachu"}}
+            for i in range(results)]
+    outputs = [{"type": "tool_result", "tool_use_id": f"{round_id}-{i}", "content": "x" * size} for i in range(results)]
+    return [{"role": "assistant", "content": uses}, {"role": "user", "content": outputs}]
+
+def turn(question: str, rounds: int, size: int) -> list:
+    messages = [{"role": "user", "content": question}]
+    for i in range(rounds):
+        messages += tool_round(f"{question}-{i}", 2, size)
+    return messages + [{"role": "assistant", "content": [{"type": "text", "text": "Here you go"}]}]
+
+def stored_conversation(*turns: list) -> list:
+    # Going through the in-process store, as the agent reads it back before every request
+    async def run():
+        store = LocalConversationStore(ttl=60)
+        for messages in turns:
+            await store.append("conversation", messages)
+        return await store.get("conversation")
+    return asyncio.run(run())
+
+def check_window(window: list) -> None:
+    first = window[0]
+    assert first["role"] == "user" and isinstance(first["content"], str)
+    tool_uses = set()
+    for message in window:
+        if isinstance(message["content"], str):
+            continue
+        for block in message["content"]:
+            if block["type"] == "tool_use":
+                tool_uses.add(block["id"])
+            if block["type"] == "tool_result":
+                assert block["tool_use_id"] in tool_uses
+
+def results_of(message: dict) -> list[str]:
+    return [block["content"] for block in message["content"]]
+
+def test():
+    messages = stored_conversation(turn("q1", 3, 2000), turn("q2", 3, 2000), turn("q3", 2, 2000),
+                                   [{"role": "user", "content": "q4"}] + tool_round("q4", 2, 2000))
+    context = ContextWindow(max_tokens=3000)
+    window, saved = context.fit(messages)
+
+    assert estimate_tokens(window) <= context.max_tokens
+    assert saved == estimate_tokens(messages) - estimate_tokens(window)
+    check_window(window)
+    # The current question and its latest tool round are sent whole
+    assert window[-3]["content"] == "q4"
+    assert results_of(window[-1]) == ["x" * 2000] * 2
+    # The stored conversation is not changed
+    assert results_of(messages[2]) == ["x" * 2000] * 2
+
+    small = stored_conversation(turn("q1", 1, 100))
+    assert context.fit(small) == (small, 0)
+
+    print("All test passed")
+
+def test_long_tool_loop():
+    # One question with ten tool rounds: the recent turns alone are over budget
+    messages = stored_conversation([{"role": "user", "content": "q1"}] +
+                                   [message for i in range(10) for message in tool_round(f"r{i}", 1, 4000)])
+    context = ContextWindow(max_tokens=2500)
+    window, saved = context.fit(messages)
+
+    assert estimate_tokens(window) <= context.max_tokens
+    assert saved > 0
+    check_window(window)
+    assert len(window) == len(messages)
+    assert results_of(window[-1]) == ["x" * 4000]
+    for message in window[2:-1:2]:
+        assert all("[compacted" in result for result in results_of(message))
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_long_tool_loop()
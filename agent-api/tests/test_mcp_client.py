@@ -0,0 +1,103 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+sys.path.insert(0, str(file_path ))
+
+from src.mcp_client import MCPClient
+
+def sse(message: dict) -> httpx.Response:
+    # The JSON is split over several data lines, which the parser must join back
+    lines = "".join(f"data: {line}\n" for line in json.dumps(message, indent=1).splitlines())
+    body = f"event: message\n{lines}\n"
+    return httpx.Response(200, content=body.encode(), headers={"content-type": "text/event-stream"})
+
+class FakeServer:
+    """
+    Minimal MCP server: sessions are numbered, tools/call answers with the session that served it.
+    """
+    def __init__(self):
+        self.sessions = 0
+        self.valid: set[str] = set()
+        self.initialize_delay = 0.0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        message = json.loads(request.content)
+        if message["method"] == "initialize":
+            await asyncio.sleep(self.initialize_delay)
+            self.sessions += 1
+            session_id = f"s{self.sessions}"
+            self.valid.add(session_id)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": message["id"], "result": {}},
+                                  headers={"mcp-session-id": session_id})
+        if "id" not in message:
+            return httpx.Response(202)
+        session_id = request.headers.get("mcp-session-id")
+        if session_id not in self.valid:
+            return httpx.Response(404, text="Session not found")
+        text = json.dumps({"session": session_id})
+        return sse({"jsonrpc": "2.0", "id": message["id"],
+                    "result": {"content": [{"type": "text", "text": text}], "isError": False}})
+
+def client_for(server: FakeServer, pool_size: int) -> MCPClient:
+    client = MCPClient()
+    client.pool_size = pool_size
+    client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    return client
+
+def test():
+    server = FakeServer()
+
+    async def run():
+        client = client_for(server, pool_size=2)
+        # Tool timeouts firing while the sessions are being opened must give their pool slots back
+        server.initialize_delay = 10
+        for _ in range(2):
+            try:
+                await asyncio.wait_for(client.call_tool("get_type", {"name": "electric"}), 0.05)
+            except asyncio.TimeoutError:
+                pass
+        leaked = client.open_sessions
+        server.initialize_delay = 0
+        result = await asyncio.wait_for(client.call_tool("get_type", {"name": "electric"}), 1)
+        await client.close()
+        return leaked, result, client
+
+    leaked, result, client = asyncio.run(run())
+
+    assert leaked == 0
+    assert json.loads(result) == {"session": "s1"}
+    assert client.open_sessions == 1
+    assert client.idle_sessions == ["s1"]
+
+    print("All test passed")
+
+def test_session_expired():
+    server = FakeServer()
+
+    async def run():
+        client = client_for(server, pool_size=2)
+        first = await client.call_tool("get_type", {"name": "electric"})
+        # The MCP server restarted: its sessions are gone, the call is retried once on a new session
+        server.valid.clear()
+        second = await client.call_tool("get_type", {"name": "electric"})
+        await client.close()
+        return first, second, client
+
+    first, second, client = asyncio.run(run())
+
+    assert json.loads(first) == {"session": "s1"}
+    assert json.loads(second) == {"session": "s2"}
+    assert client.open_sessions == 1
+    assert client.idle_sessions == ["s2"]
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_session_expired()
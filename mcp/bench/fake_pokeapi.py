@@ -0,0 +1,116 @@
+"""
+Local stand-in for PokeAPI, for benchmarks.
+
+It serves the payloads under api_samples/ for any name of a synthetic catalog ("pokemon-1" ... "pokemon-N",
+"move-1" ..., the 18 real types) with the name and id swapped in, plus paginated listings of the catalog.
+Latency and error rate are configurable, so runs are reproducible and never touch the real upstream.
+Responses carry an ETag and conditional requests get 304 Not Modified, like the real API.
+
+Run from the mcp directory:
+    fake_latency_ms=50 fake_error_rate=0.01 uvicorn bench.fake_pokeapi:app --port 9000
+and start the MCP server with pokeapi_base_url=http://localhost:9000/api/v2
+
+GET /_stats returns the requests served per endpoint and status, POST /_reset clears them.
+"""
+
+import asyncio
+import json
+import os
+import random
+from collections import Counter
+from pathlib import Path
+from fastapi import FastAPI, Request, Response
+
+api_samples = Path(__file__).parent.parent.parent / "api_samples"
+
+# Mean latency and jitter (milliseconds) added to every request, and the share of requests failing with 503
+latency_ms = float(os.getenv("fake_latency_ms", 50))
+jitter_ms = float(os.getenv("fake_jitter_ms", 20))
+error_rate = float(os.getenv("fake_error_rate", 0))
+
+type_names = ["normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+              "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
+
+def _catalog(resource: str, count: int) -> list[str]:
+    return [f"{resource}-{i}" for i in range(1, count + 1)]
+
+catalogs = {
+    "pokemon": _catalog("pokemon", int(os.getenv("fake_pokemon_count", 1000))),
+    "move": _catalog("move", int(os.getenv("fake_move_count", 900))),
+    "ability": _catalog("ability", int(os.getenv("fake_ability_count", 300))),
+    "type": type_names,
+}
+catalog_ids = {resource: {name: i for i, name in enumerate(names, 1)} for resource, names in catalogs.items()}
+
+def _template(resource: str) -> str:
+    """
+    It serializes a fixture once, with placeholders for the name and id, so serving it is a string replace.
+    """
+    payload = json.loads((api_samples / f"raw_{resource}.json").read_text())
+    return json.dumps({**payload, "id": "__id__", "name": "__name__"})
+
+templates = {resource: _template(resource) for resource in catalogs}
+
+app = FastAPI(title="Fake PokeAPI")
+served = Counter()
+
+def _lookup(resource: str, key: str) -> tuple[int, str] | None:
+    """
+    It returns the (id, name) of a catalog entry given its name or id, or None if there is no such entry.
+    """
+    names = catalogs[resource]
+    if key.isdigit():
+        index = int(key)
+        return (index, names[index - 1]) if 1 <= index <= len(names) else None
+    if key in catalog_ids[resource]:
+        return catalog_ids[resource][key], key
+    return None
+
+async def _delay() -> None:
+    await asyncio.sleep(max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000)
+
+@app.get("/_stats")
+async def stats():
+    by_endpoint = Counter()
+    for (resource, status), count in served.items():
+        by_endpoint[resource] += count
+    return {"total": sum(served.values()), "by_endpoint": dict(by_endpoint),
+            "by_status": {f"{resource} {status}": count for (resource, status), count in served.items()}}
+
+@app.post("/_reset")
+async def reset():
+    served.clear()
+    return {"status": "reset"}
+
+@app.get("/api/v2/{resource}")
+async def listing(resource: str, limit: int = 20, offset: int = 0):
+    await _delay()
+    if resource not in catalogs:
+        served[(resource, 404)] += 1
+        return Response(status_code=404)
+    served[(resource, 200)] += 1
+    names = catalogs[resource]
+    results = [{"name": name, "url": f"/api/v2/{resource}/{offset + i + 1}/"}
+               for i, name in enumerate(names[offset:offset + limit])]
+    return {"count": len(names), "next": None, "previous": None, "results": results}
+
+@app.get("/api/v2/{resource}/{key}")
+async def detail(resource: str, key: str, request: Request):
+    await _delay()
+    entry = _lookup(resource, key.strip("/")) if resource in catalogs else None
+    if entry is None:
+        served[(resource, 404)] += 1
+        return Response(status_code=404)
+    if random.random() < error_rate:
+        served[(resource, 503)] += 1
+        return Response(status_code=503)
+
+    resource_id, name = entry
+    etag = f'"{resource}-{resource_id}"'
+    if request.headers.get("if-none-match") == etag:
+        served[(resource, 304)] += 1
+        return Response(status_code=304, headers={"ETag": etag})
+
+    served[(resource, 200)] += 1
+    body = templates[resource].replace('"__id__"', str(resource_id), 1).replace('"__name__"', f'"{name}"', 1)
+    return Response(body, media_type="application/json", headers={"ETag": etag})
@@ -0,0 +1,204 @@
+"""
+Load generator for the MCP server.
+
+It opens one MCP session per worker and calls tools on /mcp as fast as the server answers, at each
+concurrency level in turn. Names are drawn from the fake PokeAPI catalog (bench/fake_pokeapi.py) with a
+skewed popularity, so a few Pokemon are asked for much more often than the rest, like real traffic.
+For each level it reports the latency percentiles per tool, the requests per second, the requests the
+fake PokeAPI actually served (from its /_stats, so retries, hedged duplicates, revalidations and listing pages
+are included), and from the MCP /stats the resource loads, the coalesced fetches and the cache hit ratio.
+
+Run from the mcp directory, with the fake PokeAPI and the MCP server pointed at it already started:
+    python -m bench.load --concurrency 1 8 32 --requests 500
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+import httpx
+
+type_names = ["normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+              "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
+
+class Workload:
+    """
+    It picks the next tool call: the tool by weight and the name by Zipf-like popularity.
+    """
+    tools = {"get_pokemon": 5, "get_move": 2, "get_ability": 2, "get_type": 1, "list_pokemon": 1}
+
+    def __init__(self, keys: int, skew: float, seed: int):
+        self.random = random.Random(seed)
+        self.keys = keys
+        self.rank_weights = list(itertools.accumulate(1 / rank ** skew for rank in range(1, keys + 1)))
+        self.tool_weights = list(itertools.accumulate(self.tools.values()))
+
+    def _name(self, resource: str) -> str:
+        rank = self.random.choices(range(1, self.keys + 1), cum_weights=self.rank_weights)[0]
+        return f"{resource}-{rank}"
+
+    def next_call(self) -> tuple[str, dict]:
+        tool = self.random.choices(list(self.tools), cum_weights=self.tool_weights)[0]
+        if tool == "get_pokemon":
+            return tool, {"name": self._name("pokemon")}
+        if tool == "get_move":
+            return tool, {"name": self._name("move")}
+        if tool == "get_ability":
+            return tool, {"name": self._name("ability")}
+        if tool == "get_type":
+            return tool, {"name": self.random.choice(type_names)}
+        return tool, {"limit": 20, "offset": self.random.randrange(0, 200, 20)}
+
+class MCPSession:
+    """
+    A minimal MCP client over streamable HTTP, one session per worker.
+    """
+    def __init__(self, http_client: httpx.AsyncClient, url: str):
+        self.http_client = http_client
+        self.url = f"{url}/mcp"
+        self.session_id: str | None = None
+        self.ids = itertools.count(1)
+
+    async def _post(self, message: dict) -> tuple[httpx.Response, dict | None]:
+        headers = {"Accept": "application/json, text/event-stream"}
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        response = await self.http_client.post(self.url, json=message, headers=headers)
+        response.raise_for_status()
+        if "id" not in message:
+            return response, None
+        if response.headers.get("content-type", "").startswith("application/json"):
+            return response, response.json()
+        for line in response.text.splitlines():
+            if line.startswith("data:"):
+                reply = json.loads(line[5:])
+                if reply.get("id") == message["id"]:
+                    return response, reply
+        return response, None
+
+    async def open(self) -> None:
+        params = {"protocolVersion": "2025-03-26", "capabilities": {},
+                  "clientInfo": {"name": "mcp-load", "version": "1.0.0"}}
+        response, _ = await self._post({"jsonrpc": "2.0", "id": next(self.ids), "method": "initialize", "params": params})
+        self.session_id = response.headers["mcp-session-id"]
+        await self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def call_tool(self, name: str, arguments: dict) -> bool:
+        """
+        It calls a tool and tells if it succeeded.
+        The tools report not found and upstream errors as a normal text result {"error": ...}, those count as failures.
+        """
+        _, reply = await self._post({"jsonrpc": "2.0", "id": next(self.ids), "method": "tools/call",
+                                     "params": {"name": name, "arguments": arguments}})
+        if not reply or "error" in reply or reply.get("result", {}).get("isError"):
+            return False
+        content = reply["result"].get("content", [])
+        return not any(block.get("text", "").startswith('{"error"') for block in content)
+
+def _cache_counts(stats: dict) -> tuple[int, int]:
+    hits = sum(cache["hits"] + cache.get("stale_hits", 0) for cache in stats["caches"].values())
+    misses = sum(cache["misses"] for cache in stats["caches"].values())
+    return hits, misses
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+async def _served(http_client: httpx.AsyncClient, upstream_url: str) -> int | None:
+    """
+    It returns how many requests the fake PokeAPI served so far, or None if it can't be reached (e.g. real PokeAPI).
+    """
+    try:
+        return (await http_client.get(f"{upstream_url}/_stats")).json()["total"]
+    except (httpx.HTTPError, ValueError, KeyError):
+        return None
+
+async def run_level(url: str, upstream_url: str, concurrency: int, requests: int, workload: Workload) -> dict:
+    """
+    It sends the requests with concurrency workers and returns the latencies and counters of the level.
+    """
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    remaining = itertools.count(requests, -1)
+
+    async with httpx.AsyncClient(timeout=60.0, limits=httpx.Limits(max_connections=concurrency)) as http_client:
+        before = (await http_client.get(f"{url}/stats")).json()
+        served_before = await _served(http_client, upstream_url)
+
+        async def worker() -> None:
+            session = MCPSession(http_client, url)
+            await session.open()
+            while next(remaining) > 0:
+                tool, arguments = workload.next_call()
+                start = time.perf_counter()
+                try:
+                    ok = await session.call_tool(tool, arguments)
+                except httpx.HTTPError:
+                    ok = False
+                latencies[tool].append((time.perf_counter() - start) * 1000)
+                if not ok:
+                    errors[tool] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+        after = (await http_client.get(f"{url}/stats")).json()
+        served_after = await _served(http_client, upstream_url)
+
+    hits_before, misses_before = _cache_counts(before)
+    hits_after, misses_after = _cache_counts(after)
+    hits, misses = hits_after - hits_before, misses_after - misses_before
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "seconds": round(elapsed, 2),
+        "rps": round(requests / elapsed, 1),
+        "upstream_requests": served_after - served_before if None not in (served_before, served_after) else None,
+        "upstream_loads": after["upstream_fetches"] - before["upstream_fetches"],
+        "coalesced_fetches": after["coalesced_fetches"] - before["coalesced_fetches"],
+        "cache_hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        "tools": {tool: {"count": len(values), "errors": errors[tool],
+                         "p50_ms": round(_percentile(values, 50), 1),
+                         "p95_ms": round(_percentile(values, 95), 1),
+                         "p99_ms": round(_percentile(values, 99), 1)}
+                  for tool, values in sorted(latencies.items())},
+    }
+
+def print_report(result: dict) -> None:
+    print(f"\nconcurrency {result['concurrency']}: {result['requests']} requests in {result['seconds']}s, "
+          f"{result['rps']} req/s, {result['upstream_requests']} upstream requests for {result['upstream_loads']} loads "
+          f"({result['coalesced_fetches']} coalesced), cache hit ratio {result['cache_hit_ratio']}")
+    print(f"  {'tool':<14}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for tool, row in result["tools"].items():
+        print(f"  {tool:<14}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the MCP server")
+    parser.add_argument("--url", default="http://localhost:8000", help="MCP server base url")
+    parser.add_argument("--upstream-url", default="http://localhost:9000", help="fake PokeAPI base url")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="requests per concurrency level")
+    parser.add_argument("--keys", type=int, default=200, help="distinct names per endpoint")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of name popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    workload = Workload(args.keys, args.skew, args.seed)
+    results = []
+    for concurrency in args.concurrency:
+        result = await run_level(args.url, args.upstream_url, concurrency, args.requests, workload)
+        print_report(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    asyncio.run(main())
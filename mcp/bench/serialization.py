@@ -0,0 +1,60 @@
+"""
+Microbenchmarks of the serialization path of a tool result, stage by stage:
+record -> model (transformers), model -> JSON text (tools), JSON-RPC envelope decoding (agent MCP client),
+tool result handed to Claude, and the conversation message encoded for Redis.
+Each stage is timed for the stdlib json path and the orjson / pass-through path used now.
+
+Run from the mcp directory:
+    python -m bench.serialization
+"""
+
+import dataclasses
+import json
+import timeit
+from pathlib import Path
+import orjson
+from src.projections import to_record
+from src.transformers import transform_pokemon_info, transform_pokemon_moves
+
+api_samples = Path(__file__).parent.parent.parent / "api_samples"
+
+def _time(statement, number: int) -> float:
+    """
+    It returns the best time per call in microseconds over a few repeats.
+    """
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+def main() -> None:
+    raw = json.loads((api_samples / "raw_pokemon.json").read_text())
+    record = to_record("pokemon", raw)
+    info = transform_pokemon_info(record)
+    moves = transform_pokemon_moves(record)
+
+    stages = []
+    stages.append(("transform record -> model", None, _time(lambda: transform_pokemon_info(record), 20000)))
+    for name, model in (("info", info), ("moves", moves)):
+        stages.append((f"tool result {name} -> text",
+                       _time(lambda: json.dumps(dataclasses.asdict(model)), 5000),
+                       _time(lambda: orjson.dumps(model).decode(), 5000)))
+
+    text = orjson.dumps(moves).decode()
+    envelope = orjson.dumps({"jsonrpc": "2.0", "id": 1,
+                             "result": {"content": [{"type": "text", "text": text}], "isError": False}})
+    stages.append(("decode JSON-RPC envelope", _time(lambda: json.loads(envelope), 5000),
+                   _time(lambda: orjson.loads(envelope), 5000)))
+    stages.append(("tool text -> tool_result", _time(lambda: json.dumps(json.loads(text)), 5000),
+                   _time(lambda: {"type": "tool_result", "content": text}, 5000)))
+
+    message = {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "toolu_1", "content": text}]}
+    stages.append(("conversation message -> Redis", _time(lambda: json.dumps(message), 5000),
+                   _time(lambda: orjson.dumps(message), 5000)))
+
+    print(f"{'stage':<32}{'json us':>10}{'now us':>10}{'speedup':>9}")
+    for stage, before, after in stages:
+        if before is None:
+            print(f"{stage:<32}{'':>10}{after:>10.2f}")
+        else:
+            print(f"{stage:<32}{before:>10.2f}{after:>10.2f}{before / after:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
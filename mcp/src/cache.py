@@ -0,0 +1,138 @@
+"""
+In-memory cache used by the PokeAPI client for each endpoint.
+
+It is a least recently used (LRU) cache with a time to live, bounded by memory size in bytes
+instead of a number of entries, since responses differ a lot in size (a Pokemon is much bigger than a type).
+The OrderedDict keeps entries in use order, so lookups, inserts and evictions are all O(1).
+Caches created with serve_stale keep returning entries older than the time to live (stale-while-revalidate),
+it is then up to the caller to refresh them.
+Entries stored by a speculative prefetch are flagged, so the cache counts the ones that were used
+(prefetch hits) and the ones evicted before anyone asked for them (prefetch wasted).
+"""
+
+import sys
+from collections import OrderedDict
+from datetime import datetime
+
+def estimate_size(obj) -> int:
+    """
+    It estimates the memory used by a JSON-like object or record, including everything it contains.
+    Shared strings are counted every time, so the estimate errs on the high side.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key) + estimate_size(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += estimate_size(item)
+    return size
+
+class CacheEntry:
+    """
+    This is the cache entry with metadata for validation and stores
+    the cached data, when it was fetched (to expire it) and its estimated size in bytes.
+    The ETag and Last-Modified validators of the response, if any, allow conditional revalidation.
+    prefetched stays True until a prefetched entry is read for the first time.
+    """
+    def __init__(self, data, fetched_at: datetime | None = None, size: int = 0):
+        self.data = data
+        self.fetched_at = fetched_at or datetime.now()
+        self.size = size
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.prefetched = False
+
+class LRUCache:
+    """
+    LRU cache with a byte budget and a time to live in seconds.
+    It keeps hit, stale hit, miss, eviction, expiration and prefetch counts.
+    """
+    def __init__(self, max_bytes: int, ttl: float, serve_stale: bool = False):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.serve_stale = serve_stale
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.prefetch_hits = 0
+        self.prefetch_wasted = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and (self.serve_stale or not self.is_expired(entry.fetched_at))
+
+    def is_expired(self, fetched_at: datetime) -> bool:
+        """
+        It tells if something fetched at the given time is older than the time to live.
+        """
+        return (datetime.now() - fetched_at).total_seconds() > self.ttl
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        It returns the entry and marks it as the most recently used, or None if missing or expired.
+        Expired entries are still returned when the cache serves stale data.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self.is_expired(entry.fetched_at):
+            if not self.serve_stale:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        if entry.prefetched:
+            entry.prefetched = False
+            self.prefetch_hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, data, fetched_at: datetime | None = None) -> CacheEntry:
+        """
+        It adds (or replaces) an entry, evicting the least recently used ones until it fits the budget.
+        Entries bigger than the whole budget are returned but not stored.
+        """
+        if key in self.entries:
+            self._remove(key)
+        entry = CacheEntry(data, fetched_at, estimate_size(data))
+        if entry.size > self.max_bytes:
+            return entry
+        while self.size + entry.size > self.max_bytes:
+            _, oldest = self.entries.popitem(last=False)
+            self.size -= oldest.size
+            self.evictions += 1
+            if oldest.prefetched:
+                self.prefetch_wasted += 1
+        self.entries[key] = entry
+        self.size += entry.size
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        """
+        It returns the size and usage counts of the cache.
+        """
+        return {"entries": len(self.entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                "avg_entry_bytes": self.size // len(self.entries) if self.entries else 0,
+                "hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations,
+                "prefetch_hits": self.prefetch_hits, "prefetch_wasted": self.prefetch_wasted}
@@ -2,8 +2,32 @@
 HTTP client for PokeAPI with connection pooling, multiple endpoint support and caching
 (although the API uses HTTP auto-catching). 
 
-Each endpoint type has its own cache for raw responses (get_pokemon, and get_pokemon_moves tools share the same cache).
-We are also keeping track of when something was added to the cache in order to delete the oldest when/if it's full (arbibrary)
+Each endpoint type has its own cache (get_pokemon, and get_pokemon_moves tools share the same cache).
+Caches hold compact records of the responses (see projections.py) instead of the full raw JSON.
+The caches are LRU caches (see cache.py) with a memory budget in bytes and a freshness window per endpoint.
+Entries older than their window are still served right away (stale-while-revalidate) while a background
+request revalidates them, conditionally (If-None-Match / If-Modified-Since) when the API gave validators,
+so a 304 refreshes an entry without downloading it again.
+Concurrent cache misses for the same resource share a single upstream request (single-flight),
+so a burst of identical lookups only costs one round trip to PokeAPI.
+Optionally, a shared second level cache sits beneath the in-memory caches, which become its near caches:
+a SQLite file (see disk_cache.py) shared by the workers of one host, or Redis (see redis_cache.py) shared by
+the whole fleet. A restarted server warms up from it instead of starting empty, every worker gets the records
+fetched by the others, and a stale near entry is first refreshed from it before asking the API again.
+In offline mode the client reads everything from a prebuilt snapshot file (see snapshot.py) and never calls the API.
+Once the name indexes (see names.py) are loaded, names are resolved locally before fetching:
+misspelled names fail right away with "did you mean" suggestions instead of a 404 round trip.
+The indexes are reloaded in the background once older than name_index_ttl (the Pokemon one with every Pokedex
+refresh), and an index that failed to load is tried again after name_index_retry, so resources added upstream
+are found without a restart.
+Names that the API reported as not found are also remembered for a short time (negative caching),
+so the same bad lookup repeated by a looping client never reaches the API again.
+Upstream requests go through an adaptive concurrency limit, are retried with jitter on 429/5xx, can be hedged
+when slow, and stop while the circuit breaker is open (see resilience.py); cached entries, even stale ones,
+are still served meanwhile.
+Optionally, loading a Pokemon also prefetches its types and abilities in the background, since they are usually
+asked for next. Prefetches are low priority: few at a time, bounded in number, only while the upstream is healthy
+and not busy, and cancelled on stop. The caches count how many prefetched entries were used or wasted.
 
 List of endpoints handled: 
     - pokemon/{name} - Pokemon data
@@ -13,150 +37,674 @@ List of endpoints handled:
     - pokemon - list of all Pokemons
 """
 
+import asyncio
+import logging
+import os
+import sqlite3
+import time
 from datetime import datetime
 import httpx
+from .cache import CacheEntry, LRUCache
+from .disk_cache import DiskCache
+from .redis_cache import RedisCache
+from .projections import PokemonRecord, MoveRecord, TypeRecord, AbilityRecord, is_current, to_record
+from .snapshot import Snapshot
+from .names import NameIndex
+from .pokedex import Pokedex, PokedexEntry
+from .observability import upstream_fetch_seconds
+from .resilience import (AdaptiveLimiter, CircuitBreaker, CircuitOpenError, UpstreamBusyError, UpstreamTimeoutError,
+                         retry_delay)
 
-class CacheEntry:
+logger = logging.getLogger(__name__)
+
+class NotFoundError(ValueError):
     """
-    This is the cache entry with metadata for validation and stores 
-    the actual API response and when it was fetched (to remove the oldest)
+    A resource that doesn't exist, with the closest existing names when they are known.
     """
-    def __init__(self, data: dict):
-        self.data = data
-        self.fetched_at = datetime.now()
+    def __init__(self, message: str, suggestions: list[str] | None = None):
+        if suggestions:
+            message = f"{message}. Did you mean: {', '.join(suggestions)}?"
+        super().__init__(message)
+        self.suggestions = suggestions or []
 
 class PokeAPIClient:
     """
     HTTP client for PokeAPI. 
     """
-    api_base = "https://pokeapi.co/api/v2"
-    cache_max = 200
+    # Overridable to point the client at a local stand-in, e.g. bench/fake_pokeapi.py
+    api_base = os.getenv("pokeapi_base_url", "https://pokeapi.co/api/v2")
+    # Memory budget (bytes) and freshness window (seconds) of each endpoint cache, stale entries are revalidated
+    cache_max_bytes = {"pokemon": 64 * 1024 * 1024, "move": 16 * 1024 * 1024,
+                       "type": 4 * 1024 * 1024, "ability": 8 * 1024 * 1024}
+    cache_ttl = {"pokemon": 24 * 3600, "move": 24 * 3600, "type": 7 * 24 * 3600, "ability": 24 * 3600}
+    # Not found answers are kept much shorter, since the resource could be added upstream
+    not_found_max_bytes = 256 * 1024
+    not_found_ttl = {"pokemon": 300, "move": 300, "type": 300, "ability": 300}
+    # How many entries per endpoint are read back from the shared cache on startup
+    warm_limit = 2000
+    # Page size and concurrency of the listing requests that load the name indexes
+    listing_page_size = 500
+    listing_concurrency = 4
+    # The full Pokedex listing is refreshed in the background once older than this (seconds)
+    pokedex_ttl = 24 * 3600
+    # Name indexes are reloaded once older than this (seconds), a failed load is tried again after name_index_retry
+    name_index_ttl = 24 * 3600
+    name_index_retry = 5 * 60
+    # Largest page returned by list_pokemon
+    listing_max = 2000
+    # Seconds allowed to connect, wait for a pooled connection and read, per attempt
+    timeout = httpx.Timeout(4.0, connect=2.0, pool=4.0)
+    # Total seconds of one upstream request: limiter wait, every attempt and the backoff sleeps between them
+    request_budget = float(os.getenv("upstream_budget_s", 10))
+    # Retries of a request answered with 429/5xx or failing on the network, within the budget
+    max_retries = 2
+    # A second identical request is sent if the first takes longer than this (seconds), 0 disables hedging
+    hedge_after = float(os.getenv("upstream_hedge_ms", 1000)) / 1000
+    # Prefetching of the types and abilities of a loaded Pokemon, its concurrency and how many may wait
+    prefetch = os.getenv("prefetch", "off") == "on"
+    prefetch_concurrency = 2
+    prefetch_max_pending = 32
 
     def __init__(self):
 
-        self.http_client = httpx.AsyncClient(base_url="https://pokeapi.co/api/v2", timeout=30.0)
-        self.pokemon_cache: dict[str, CacheEntry] = {}
-        self.move_cache: dict[str, CacheEntry] = {}
-        self.type_cache: dict[str, CacheEntry] = {}
-        self.ability_cache: dict[str, CacheEntry] = {}
+        self.http_client = httpx.AsyncClient(base_url="https://pokeapi.co/api/v2", timeout=self.timeout)
+        # Answers are only a sign of overload once slower than a read timeout, a slow but healthy API keeps its limit
+        self.limiter = AdaptiveLimiter(latency_target=self.timeout.read)
+        self.breaker = CircuitBreaker()
+        self.retries = 0
+        self.hedged_requests = 0
+        self.queue_timeouts = 0
+        self.pokemon_cache = LRUCache(self.cache_max_bytes["pokemon"], self.cache_ttl["pokemon"], serve_stale=True)
+        self.move_cache = LRUCache(self.cache_max_bytes["move"], self.cache_ttl["move"], serve_stale=True)
+        self.type_cache = LRUCache(self.cache_max_bytes["type"], self.cache_ttl["type"], serve_stale=True)
+        self.ability_cache = LRUCache(self.cache_max_bytes["ability"], self.cache_ttl["ability"], serve_stale=True)
+        # Error messages of the lookups that ended in a 404, per endpoint
+        self.not_found_caches = {resource: LRUCache(self.not_found_max_bytes, ttl)
+                                 for resource, ttl in self.not_found_ttl.items()}
+        # Upstream requests currently running, keyed by endpoint path (e.g. "pokemon/pikachu")
+        self.in_flight: dict[str, asyncio.Task] = {}
+        self.upstream_fetches = 0
+        self.coalesced_fetches = 0
+        self.shared_cache: DiskCache | RedisCache | None = None
+        self.shared_hits = 0
+        self.snapshot: Snapshot | None = None
+        self.name_indexes: dict[str, NameIndex] = {}
+        # When each index was last loaded or tried, successful or not (time.monotonic)
+        self.name_indexes_checked_at: dict[str, float] = {}
+        self.names_rejected = 0
+        # Background work (e.g. loading the name indexes) cancelled on stop
+        self.background_tasks: set[asyncio.Task] = set()
+        # Endpoints being revalidated, so a stale entry is only refreshed once at a time
+        self.revalidating: set[str] = set()
+        self.pokedex: Pokedex | None = None
+        self.pokedex_fetched_at = 0.0
+        self.pokedex_lock = asyncio.Lock()
+        self.revalidations = 0
+        self.not_modified = 0
+        # Endpoints being prefetched, removed once loaded or when a real lookup joins the request
+        self.prefetching: set[str] = set()
+        self.prefetch_slots = asyncio.Semaphore(self.prefetch_concurrency)
+        self.prefetches = 0
+        self.prefetches_skipped = 0
+
+    async def start(self, cache_path: str | None = None, snapshot_path: str | None = None,
+                    cache_redis_url: str | None = None) -> None:
+        """
+        This function opens the snapshot and the shared cache, if their paths are given.
+        With a snapshot, the client works offline. The shared cache is Redis if its url is given,
+        otherwise the SQLite file at cache_path. The memory caches are warmed from it.
+        A shared cache that can't be opened is logged and left out, the server still starts with its memory caches.
+        """
+        if snapshot_path:
+            self.snapshot = Snapshot(snapshot_path)
+            sizes = {resource: len(self.snapshot.names(resource)) for resource in self._caches()}
+            logger.info("Snapshot opened", extra={"path": snapshot_path, "sizes": sizes})
+        if cache_redis_url:
+            self.shared_cache = RedisCache(cache_redis_url)
+        elif cache_path:
+            self.shared_cache = DiskCache(cache_path)
+        else:
+            return
+        try:
+            await self.shared_cache.open()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Shared cache not opened, running without it",
+                           extra={"backend": type(self.shared_cache).__name__, "error": str(e)})
+            self.shared_cache = None
+            return
+        for resource, cache in self._caches().items():
+            for key, data, fetched_at in await self.shared_cache.load_recent(resource, self.warm_limit):
+                if is_current(resource, data):
+                    cache.put(key, to_record(resource, data), fetched_at)
+        sizes = {resource: len(cache) for resource, cache in self._caches().items()}
+        logger.info("Shared cache opened", extra={"backend": type(self.shared_cache).__name__, "sizes": sizes})
 
     async def stop(self) -> None:
         """
         This function closes the HTTP client and clears the caches after.
+        Pending shared cache writes are flushed first, so they are available on the next start.
         """
+        for task in self.background_tasks:
+            task.cancel()
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
         await self.http_client.aclose()
+        if self.snapshot:
+            self.snapshot.close()
+            self.snapshot = None
+        if self.shared_cache:
+            await self.shared_cache.close()
+            self.shared_cache = None
+        self.pokedex = None
+        self.prefetching.clear()
         self._clear_all_caches()
-    
-    def _clear_all_caches(self) -> None:
+
+    def _run_in_background(self, coroutine) -> asyncio.Task:
         """
-        Clearing all cachec for the new session to start.
+        It starts a task that is tracked, so it can be cancelled when the client stops.
+        """
+        task = asyncio.create_task(coroutine)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    def load_name_indexes_in_background(self) -> asyncio.Task:
+        """
+        It loads the name indexes without making the server wait for them.
+        """
+        return self._run_in_background(self.load_name_indexes())
+
+    async def load_name_indexes(self) -> None:
+        """
+        It builds the name index of each endpoint from the snapshot or from the listing endpoints.
+        An endpoint whose names can't be loaded keeps working without an index until a later retry.
+        """
+        for resource in self._caches():
+            await self._load_name_index(resource)
+        sizes = {resource: len(index) for resource, index in self.name_indexes.items()}
+        logger.info("Name indexes loaded", extra={"sizes": sizes})
+
+    async def _load_name_index(self, resource: str) -> None:
+        self.name_indexes_checked_at[resource] = time.monotonic()
+        try:
+            if resource == "pokemon":
+                # The Pokedex listing is loaded anyway and fills the index, a stale one is refreshed in the background
+                await self.get_pokedex()
+                return
+            names = self.snapshot.names(resource) if self.snapshot else await self._fetch_names(resource)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning("Name index not loaded", extra={"resource": resource, "error": str(e)})
+            return
+        finally:
+            self.revalidating.discard(f"names/{resource}")
+        self.name_indexes[resource] = NameIndex(names)
+
+    def _reload_name_index_if_due(self, resource: str) -> None:
+        """
+        It reloads a name index in the background once it is older than name_index_ttl,
+        or if its last load failed more than name_index_retry seconds ago.
+        Nothing happens before the first load was tried.
+        """
+        checked_at = self.name_indexes_checked_at.get(resource)
+        if self.snapshot or checked_at is None or f"names/{resource}" in self.revalidating:
+            return
+        due = self.name_index_ttl if resource in self.name_indexes else self.name_index_retry
+        if time.monotonic() - checked_at > due:
+            self.revalidating.add(f"names/{resource}")
+            self._run_in_background(self._load_name_index(resource))
+
+    async def _fetch_listing_page(self, resource: str, offset: int) -> dict:
+        response = await self._send(resource, f"{self.api_base}/{resource}",
+                                    params={"limit": self.listing_page_size, "offset": offset})
+        if response.status_code != 200:
+            raise ValueError(f"PokeAPI error: {response.status_code}")
+        return response.json()
+
+    async def _fetch_listing(self, resource: str) -> list[dict]:
         """
-        self.pokemon_cache = {}
-        self.move_cache = {}
-        self.type_cache = {}
-        self.ability_cache = {}
+        It fetches the full listing of an endpoint: the first page gives the total count,
+        then the remaining pages are fetched concurrently.
+        """
+        first = await self._fetch_listing_page(resource, 0)
+        offsets = range(self.listing_page_size, first["count"], self.listing_page_size)
+        semaphore = asyncio.Semaphore(self.listing_concurrency)
+
+        async def fetch_page(offset: int) -> dict:
+            async with semaphore:
+                return await self._fetch_listing_page(resource, offset)
+
+        pages = [first, *await asyncio.gather(*[fetch_page(offset) for offset in offsets])]
+        return [item for page in pages for item in page["results"]]
+
+    async def _fetch_names(self, resource: str) -> list[str]:
+        return [item["name"] for item in await self._fetch_listing(resource)]
+
+    async def _load_pokedex(self) -> None:
+        if self.snapshot:
+            entries = [PokedexEntry(self.snapshot.get("pokemon", name).id, name) for name in self.snapshot.names("pokemon")]
+            self.pokedex = Pokedex(entries)
+        else:
+            self.pokedex = Pokedex.from_listing(await self._fetch_listing("pokemon"))
+        self.pokedex_fetched_at = time.monotonic()
+        self.name_indexes["pokemon"] = NameIndex(self.pokedex.names())
+
+    async def _refresh_pokedex(self) -> None:
+        try:
+            await self._load_pokedex()
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning("Pokedex refresh failed", extra={"error": str(e)})
+        finally:
+            self.revalidating.discard("pokedex")
+
+    async def get_pokedex(self) -> Pokedex:
+        """
+        It returns the full Pokedex listing, loading it on first use.
+        Once older than pokedex_ttl it is still returned right away and refreshed in the background.
+        """
+        if self.pokedex is None:
+            async with self.pokedex_lock:
+                if self.pokedex is None:
+                    await self._load_pokedex()
+        elif (not self.snapshot and "pokedex" not in self.revalidating
+              and time.monotonic() - self.pokedex_fetched_at > self.pokedex_ttl):
+            self.revalidating.add("pokedex")
+            self._run_in_background(self._refresh_pokedex())
+        return self.pokedex
+
+    def _resolve_name(self, resource: str, resource_type: str, key: str) -> str:
+        """
+        It maps a key to the real name using the name index, if loaded.
+        Unknown names raise NotFoundError with suggestions, without any request. Numeric ids are left as they are.
+        """
+        self._reload_name_index_if_due(resource)
+        index = self.name_indexes.get(resource)
+        if index is None or key.isdigit():
+            return key
+        name = index.resolve(key)
+        if name is None:
+            self.names_rejected += 1
+            raise NotFoundError(f"{resource_type} '{key}' not found", index.suggest(key))
+        return name
 
-    def _add_to_cache(self, cache: dict[str, CacheEntry], key: str, data: dict) -> None:
+    def _caches(self) -> dict[str, LRUCache]:
         """
-        Adding new information to cache and replacing if full.
+        It maps each endpoint to its memory cache.
         """
-        # Removing oldest entries if cache is full
-        if len(cache) >= self.cache_max:
-            sorted_keys = sorted(cache.keys(), key=lambda k: cache[k].fetched_at)
-            # We are removing the 20 percent of the cache if it reaching its max
-            remove_count = max(1, len(sorted_keys) // 20)
-            for k in sorted_keys[:remove_count]:
-                del cache[k]
-        cache[key] = CacheEntry(data)
+        return {"pokemon": self.pokemon_cache, "move": self.move_cache,
+                "type": self.type_cache, "ability": self.ability_cache}
+    
+    def _clear_all_caches(self) -> None:
+        """
+        Clearing all cachec for the new session to start.
+        """
+        for cache in [*self._caches().values(), *self.not_found_caches.values()]:
+            cache.clear()
 
-    async def _fetch(self, endpoint: str, resource_type: str, name: str) -> dict:
+    async def _fetch(self, endpoint: str, resource_type: str, name: str, headers: dict | None = None) -> httpx.Response:
         """
         This is a generic fetch method for any PokeAPI endpoint.
-        It returns a raw JSON response as a dictionary.
+        It returns the successful response (200, or 304 to a conditional request), its body is the raw JSON.
         """
         url = f"{self.api_base}/{endpoint}"
-        response = await self.http_client.get(url)
-        
+        response = await self._send(endpoint.split("/", 1)[0], url, headers=headers)
+
         if response.status_code == 404:
-            raise ValueError(f"{resource_type} '{name}' not found")
+            raise NotFoundError(f"{resource_type} '{name}' not found")
+        if response.status_code == 304 and headers:
+            return response
         if response.status_code != 200:
             raise ValueError(f"PokeAPI error: {response.status_code}")
 
-        return response.json()
+        return response
+
+    async def _send(self, resource: str, url: str, params: dict | None = None,
+                    headers: dict | None = None) -> httpx.Response:
+        """
+        It sends a GET to PokeAPI, retrying throttled (429), failed (5xx) and network errors with jittered
+        backoff (or the Retry-After asked for). It fails fast with CircuitOpenError while the upstream is down.
+        Everything is bounded by request_budget: it raises UpstreamTimeoutError once the budget is used up,
+        or UpstreamBusyError if it ran out while still waiting for a limiter slot. Time spent queued is not the
+        upstream's fault: only a sent request that went unanswered for a whole read timeout counts as a failure
+        for the circuit breaker, as a ReadTimeout would. A retry is only made if it can still finish in time (a whole read timeout after a read timeout).
+        A Retry-After that does not fit in the budget is honored by failing right away and opening the circuit
+        until then, instead of asking again too early.
+        The last response is returned even if it is still an error, the caller decides what it means.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.request_budget
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError("PokeAPI is unavailable right now, try again shortly")
+            try:
+                async with asyncio.timeout_at(deadline):
+                    await self.limiter.acquire()
+            except TimeoutError:
+                self.queue_timeouts += 1
+                raise UpstreamBusyError("Too many PokeAPI requests are queued, try again shortly") from None
+            sent_at = loop.time()
+            try:
+                async with asyncio.timeout_at(deadline):
+                    response = await self._attempt(resource, url, params, headers)
+            except TimeoutError:
+                if loop.time() - sent_at >= self.timeout.read:
+                    self.breaker.record_failure()
+                raise UpstreamTimeoutError(f"PokeAPI did not answer within {self.request_budget:g}s") from None
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                delay = retry_delay(attempt, None)
+                needed = delay + (self.timeout.read if isinstance(e, httpx.ReadTimeout) else 0)
+                if attempt == self.max_retries or loop.time() + needed >= deadline:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code != 429 and response.status_code < 500:
+                self.breaker.record_success()
+                return response
+            self.breaker.record_failure()
+            retry_after = response.headers.get("retry-after")
+            delay = retry_delay(attempt, retry_after)
+            if retry_after and loop.time() + delay >= deadline:
+                self.breaker.trip(delay)
+                return response
+            if attempt == self.max_retries or loop.time() + delay >= deadline:
+                return response
+            self.retries += 1
+            await asyncio.sleep(delay)
 
-    async def get_pokemon_raw(self, name: str) -> dict:
+    async def _attempt(self, resource: str, url: str, params: dict | None, headers: dict | None) -> httpx.Response:
+        """
+        It sends one request in the limiter slot taken by the caller, records its latency and releases the slot.
         """
-        This function gets raw Pokemon data from /pokemon/{name}.
+        start = time.perf_counter()
+        overloaded = True
+        try:
+            response = await self._hedged_get(url, params, headers)
+            overloaded = response.status_code == 429 or response.status_code >= 500
+            upstream_fetch_seconds.labels(resource, str(response.status_code)).observe(time.perf_counter() - start)
+            return response
+        except httpx.HTTPError:
+            upstream_fetch_seconds.labels(resource, "error").observe(time.perf_counter() - start)
+            raise
+        finally:
+            await self.limiter.release(time.perf_counter() - start, overloaded)
+
+    async def _hedged_get(self, url: str, params: dict | None, headers: dict | None) -> httpx.Response:
+        """
+        It sends the request and, if no answer came after hedge_after seconds, the same request again;
+        the first successful answer wins and the other request is cancelled.
+        The hedge shares the limiter slot of the first request, it is only sent for the slow tail.
+        """
+        if not self.hedge_after:
+            return await self.http_client.get(url, params=params, headers=headers)
+
+        requests = {asyncio.ensure_future(self.http_client.get(url, params=params, headers=headers))}
+        done, _ = await asyncio.wait(requests, timeout=self.hedge_after)
+        if not done:
+            self.hedged_requests += 1
+            requests.add(asyncio.ensure_future(self.http_client.get(url, params=params, headers=headers)))
+        try:
+            while True:
+                done, pending = await asyncio.wait(requests, return_when=asyncio.FIRST_COMPLETED)
+                for request in done:
+                    if request.exception() is None:
+                        return request.result()
+                if not pending:
+                    return done.pop().result()
+                # The first one failed, the other one may still succeed
+                requests = pending
+        finally:
+            for request in requests:
+                request.cancel()
+
+    def _store(self, cache: LRUCache, resource: str, key: str, response: httpx.Response) -> tuple:
+        """
+        It caches the record of a fetched response along with its validators and queues it for the shared cache.
+        """
+        record = to_record(resource, response.json())
+        entry = cache.put(key, record)
+        entry.etag = response.headers.get("etag")
+        entry.last_modified = response.headers.get("last-modified")
+        if self.shared_cache:
+            self.shared_cache.put(resource, key, record, entry.fetched_at)
+        return record
+
+    def _revalidate_if_stale(self, cache: LRUCache, resource: str, resource_type: str, key: str,
+                             entry: CacheEntry) -> None:
+        """
+        It starts a background revalidation of an entry older than its freshness window.
+        """
+        endpoint = f"{resource}/{key}"
+        if (self.snapshot or not cache.is_expired(entry.fetched_at) or endpoint in self.revalidating
+                or self.breaker.state == "open"):
+            return
+        self.revalidating.add(endpoint)
+        task = self._run_in_background(self._revalidate(cache, resource, resource_type, key, entry))
+        task.add_done_callback(lambda t: self.revalidating.discard(endpoint))
+
+    async def _revalidate(self, cache: LRUCache, resource: str, resource_type: str, key: str,
+                          entry: CacheEntry) -> None:
+        """
+        It refreshes a stale entry: a 304 only renews its fetch time, a 200 replaces it.
+        If another server already refreshed it, the fresh copy is taken from the shared cache instead.
+        Failures keep the stale entry, it will be tried again on a later request.
+        """
+        if self.shared_cache:
+            stored = await self.shared_cache.get(resource, key)
+            if stored and is_current(resource, stored[0]) and not cache.is_expired(stored[1]):
+                self.shared_hits += 1
+                cache.put(key, to_record(resource, stored[0]), stored[1])
+                return
+
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        try:
+            response = await self._fetch(f"{resource}/{key}", resource_type, key, headers)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Revalidation failed", extra={"resource": resource, "key": key, "error": str(e)})
+            return
+
+        self.revalidations += 1
+        if response.status_code == 304:
+            self.not_modified += 1
+            entry.fetched_at = datetime.now()
+            if self.shared_cache:
+                self.shared_cache.put(resource, key, entry.data, entry.fetched_at)
+        else:
+            self._store(cache, resource, key, response)
+
+    async def _load(self, cache: LRUCache, resource: str, resource_type: str, key: str) -> tuple:
+        """
+        It loads a resource from the shared cache or, if missing, from the API and stores its compact record
+        in the given cache. Fetched records are queued for the shared cache as well.
+        """
+        if self.shared_cache:
+            stored = await self.shared_cache.get(resource, key)
+            if stored and is_current(resource, stored[0]):
+                self.shared_hits += 1
+                data, fetched_at = stored
+                record = to_record(resource, data)
+                entry = cache.put(key, record, fetched_at)
+                self._revalidate_if_stale(cache, resource, resource_type, key, entry)
+                self._schedule_prefetch(resource, record)
+                return record
+
+        self.upstream_fetches += 1
+        try:
+            response = await self._fetch(f"{resource}/{key}", resource_type, key)
+        except NotFoundError as e:
+            self.not_found_caches[resource].put(key, str(e))
+            raise
+        record = self._store(cache, resource, key, response)
+        self._schedule_prefetch(resource, record)
+        return record
+
+    def _schedule_prefetch(self, resource: str, record: tuple) -> None:
+        """
+        It starts background loads of the types and abilities of a Pokemon that are not cached yet.
+        They are skipped when the budget is used up, the circuit is not closed or the upstream limit
+        is already half used, so real lookups always come first.
+        """
+        if not self.prefetch or resource != "pokemon":
+            return
+        related = [(self.type_cache, "type", "Type", name) for name in record.types]
+        related += [(self.ability_cache, "ability", "Ability", name) for name in record.abilities]
+        for cache, related_resource, resource_type, key in related:
+            endpoint = f"{related_resource}/{key}"
+            if (key in cache or endpoint in self.in_flight or endpoint in self.prefetching
+                    or key in self.not_found_caches[related_resource]):
+                continue
+            if (len(self.prefetching) >= self.prefetch_max_pending or self.breaker.state != "closed"
+                    or self.limiter.in_use >= self.limiter.limit / 2):
+                self.prefetches_skipped += 1
+                continue
+            self.prefetching.add(endpoint)
+            self._run_in_background(self._prefetch(cache, related_resource, resource_type, key))
+
+    async def _prefetch(self, cache: LRUCache, resource: str, resource_type: str, key: str) -> None:
+        """
+        It loads one related resource through the shared lookup, so a real request for it joins this one.
+        The stored entry is flagged as prefetched unless a real lookup already waited for it.
+        """
+        endpoint = f"{resource}/{key}"
+        try:
+            async with self.prefetch_slots:
+                if endpoint not in self.prefetching or key in cache or endpoint in self.in_flight:
+                    return
+                self.prefetches += 1
+                await self._get(cache, resource, resource_type, key)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug("Prefetch failed", extra={"resource": resource, "key": key, "error": str(e)})
+            return
+        finally:
+            prefetched = endpoint in self.prefetching
+            self.prefetching.discard(endpoint)
+        entry = cache.entries.get(key)
+        if prefetched and entry:
+            entry.prefetched = True
+
+    def _load_done(self, endpoint: str, task: asyncio.Task) -> None:
+        """
+        It removes a finished request from the in-flight registry.
+        """
+        if self.in_flight.get(endpoint) is task:
+            del self.in_flight[endpoint]
+        # Reading the exception so it is not reported as "never retrieved" if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _get(self, cache: LRUCache, resource: str, resource_type: str, key: str) -> tuple:
+        """
+        This is the shared lookup used by all the getters.
+        It returns cached data if present (revalidating it in the background when stale), otherwise it joins
+        the request already in flight for the same resource or starts a new one. Errors are raised to every waiting caller.
+        """
+        key = self._resolve_name(resource, resource_type, key)
+        # Checking the cache for previous data first
+        entry = cache.get(key)
+        if entry:
+            self._revalidate_if_stale(cache, resource, resource_type, key, entry)
+            return entry.data
+
+        # In offline mode the snapshot is the whole dataset, so a missing record is a missing resource
+        if self.snapshot:
+            record = self.snapshot.get(resource, key)
+            if record is None:
+                raise NotFoundError(f"{resource_type} '{key}' not found")
+            cache.put(key, record)
+            return record
+
+        not_found = self.not_found_caches[resource].get(key)
+        if not_found:
+            raise NotFoundError(not_found.data)
+
+        endpoint = f"{resource}/{key}"
+        task = self.in_flight.get(endpoint)
+        if task is None:
+            task = asyncio.create_task(self._load(cache, resource, resource_type, key))
+            self.in_flight[endpoint] = task
+            task.add_done_callback(lambda t: self._load_done(endpoint, t))
+        else:
+            self.coalesced_fetches += 1
+            if endpoint in self.prefetching:
+                # Still a prefetch hit: the request was already on its way
+                self.prefetching.discard(endpoint)
+                cache.prefetch_hits += 1
+        # Shielding so a cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def get_pokemon_raw(self, name: str) -> PokemonRecord:
+        """
+        This function gets Pokemon data from /pokemon/{name}.
     
         This is a large response containing all info about a single pokemon.
-        Then, it caches the response for future requests.
+        Then, it caches its compact record (types, abilities, stats, size and move names) for future requests.
         """
         key: str = name.lower().strip()
-        # Checking the cache for previous data first
-        if key in self.pokemon_cache:
-            return self.pokemon_cache[key].data
-        # If missed then we fetch the data directly from API
-        data = await self._fetch(f"pokemon/{key}", "Pokemon", key)
-        self._add_to_cache(self.pokemon_cache, key, data)
-        return data
+        return await self._get(self.pokemon_cache, "pokemon", "Pokemon", key)
 
-    async def get_move_raw(self, name: str) -> dict:
+    async def get_move_raw(self, name: str) -> MoveRecord:
         """
-        This function gets raw move data from /move/{name}.
+        This function gets move data from /move/{name}.
         It contains: power, accuracy, type, PP, damage class, effect description.
         """
         key = name.lower().strip().replace(" ", "-")
+        return await self._get(self.move_cache, "move", "Move", key)
 
-        if key in self.move_cache:
-            return self.move_cache[key].data
-        
-        data = await self._fetch(f"move/{key}", "Move", key)
-        self._add_to_cache(self.move_cache, key, data)
-        return data
-
-    async def get_type_raw(self, name: str) -> dict:
+    async def get_type_raw(self, name: str) -> TypeRecord:
         """
-        This function gets raw type data from /type/{name}.
+        This function gets type data from /type/{name}.
         It contains: damage relations (what this type is strong/weak against).
         """
         key = name.lower().strip()
+        return await self._get(self.type_cache, "type", "Type", key)
 
-        if key in self.type_cache:
-            return self.type_cache[key].data
-        
-        data = await self._fetch(f"type/{key}", "Type", key)
-        self._add_to_cache(self.type_cache, key, data)
-        return data
-
-    async def get_ability_raw(self, name: str) -> dict:
+    async def get_ability_raw(self, name: str) -> AbilityRecord:
         """
-        This function gets raw ability data from /ability/{name}.
+        This function gets ability data from /ability/{name}.
         It contains: effect description, which Pokemon have this ability.
         """
         key = name.lower().strip().replace(" ", "-")
+        return await self._get(self.ability_cache, "ability", "Ability", key)
 
-        if key in self.ability_cache:
-            return self.ability_cache[key].data
-        
-        data = await self._fetch(f"ability/{key}", "Ability", key)
-        self._add_to_cache(self.ability_cache, key, data)
-        return data
-
-    async def list_pokemon(self, limit: int = 20, offset: int = 0) -> dict:
+    async def list_pokemon(self, limit: int = 20, offset: int = 0, prefix: str | None = None,
+                           min_id: int | None = None, max_id: int | None = None) -> dict:
         """
-        This function gets a list of Pokemon names from /pokemon.
-        We are not caching it since it's just a list of names/URLs.
-        We are also limiting the items displayed since the list seems pretty long.
+        This function returns one page of the Pokedex, optionally filtered by name prefix and id range.
+        It is served from the cached full listing, so after the first call it never goes to the network.
+        The offset actually used is returned too, since out of range values are clamped.
         """
-        limit = max(1, min(limit, 100))
+        limit = max(1, min(limit, self.listing_max))
         offset = max(0, offset)
-        
-        url = f"{self.api_base}/pokemon"
-        params = {"limit": limit, "offset": offset}
-        response = await self.http_client.get(url, params=params)
 
-        if response.status_code != 200:
-            raise ValueError(f"PokeAPI error: {response.status_code}")
-        return response.json()
+        pokedex = await self.get_pokedex()
+        count, page = pokedex.page(limit, offset, prefix, min_id, max_id)
+        return {"count": count, "offset": offset, "results": [{"name": entry.name, "id": entry.id} for entry in page]}
+
+    def get_stats(self) -> dict:
+        """
+        It returns the cache statistics and how many upstream requests were made, saved by coalescing
+        or answered by the shared cache.
+        """
+        return {"upstream_fetches": self.upstream_fetches,
+                "coalesced_fetches": self.coalesced_fetches,
+                "shared_hits": self.shared_hits,
+                "names_rejected": self.names_rejected,
+                "revalidations": self.revalidations,
+                "not_modified": self.not_modified,
+                "in_flight": len(self.in_flight),
+                "retries": self.retries,
+                "hedged_requests": self.hedged_requests,
+                "queue_timeouts": self.queue_timeouts,
+                "prefetches": self.prefetches,
+                "prefetches_skipped": self.prefetches_skipped,
+                "upstream_limit": int(self.limiter.limit),
+                "circuit": self.breaker.state,
+                "pokedex_entries": len(self.pokedex) if self.pokedex else 0,
+                "caches": {resource: cache.stats() for resource, cache in self._caches().items()},
+                "not_found_caches": {resource: cache.stats() for resource, cache in self.not_found_caches.items()}}
 
 pokeapi_client = PokeAPIClient()
\ No newline at end of file
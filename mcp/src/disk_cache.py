@@ -0,0 +1,152 @@
+"""
+SQLite-backed second level cache for PokeAPI responses.
+
+The in-memory caches in the client are lost on every restart, so every response is also
+written here and read back on startup to warm the memory caches again.
+Writes are write-behind: they are queued in memory and flushed in batches by a background task,
+so a cache miss never waits on the disk.
+
+Entries are keyed by endpoint type and name, e.g. ("pokemon", "pikachu").
+Several server processes on the same host can share one file: the database runs in WAL mode, so readers
+never block the writer, and a writer waits (busy_timeout) instead of failing when another one holds the lock.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """
+    Persistent cache stored in a single SQLite file.
+    """
+    flush_interval = 1.0
+    # Milliseconds a write waits for another process holding the database lock
+    busy_timeout = 5000
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db: sqlite3.Connection | None = None
+        # The connection is shared by the worker threads, so access is serialized
+        self.lock = threading.Lock()
+        self.pending: dict[tuple[str, str], tuple[dict, datetime]] = {}
+        # The batch currently being written, still readable until the write is done
+        self.flushing: dict[tuple[str, str], tuple[dict, datetime]] = {}
+        self.flush_task: asyncio.Task | None = None
+
+    async def open(self) -> None:
+        """
+        It opens (or creates) the database and starts the write-behind task.
+        """
+        self.db = await asyncio.to_thread(self._connect)
+        self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """
+        It stops the write-behind task, writes what is still pending and closes the database.
+        A failing last write is logged and the entries are lost, the database is closed anyway.
+        """
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        if self.db:
+            try:
+                await self.flush()
+            except sqlite3.Error as e:
+                logger.error("Disk cache flush failed on close",
+                             extra={"error": str(e), "entries_lost": len(self.pending)})
+            finally:
+                self.db.close()
+                self.db = None
+                self.pending = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False, timeout=self.busy_timeout / 1000)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(f"PRAGMA busy_timeout={self.busy_timeout}")
+        # In WAL mode this is still safe against corruption, and commits don't wait on an fsync
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS entries ("
+                   "endpoint TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL, fetched_at REAL NOT NULL, "
+                   "PRIMARY KEY (endpoint, name))")
+        db.commit()
+        return db
+
+    async def get(self, endpoint: str, name: str) -> tuple[dict, datetime] | None:
+        """
+        It returns the stored data and its fetch time, or None if the entry is not on disk.
+        """
+        queued = self.pending.get((endpoint, name)) or self.flushing.get((endpoint, name))
+        if queued:
+            return queued
+        if not self.db:
+            return None
+        return await asyncio.to_thread(self._select, endpoint, name)
+
+    def _select(self, endpoint: str, name: str) -> tuple[dict, datetime] | None:
+        with self.lock:
+            row = self.db.execute("SELECT data, fetched_at FROM entries WHERE endpoint = ? AND name = ?",
+                                  (endpoint, name)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), datetime.fromtimestamp(row[1])
+
+    def put(self, endpoint: str, name: str, data: dict, fetched_at: datetime) -> None:
+        """
+        It queues an entry to be written by the next flush.
+        """
+        self.pending[(endpoint, name)] = (data, fetched_at)
+
+    async def load_recent(self, endpoint: str, limit: int) -> list[tuple[str, dict, datetime]]:
+        """
+        It returns the most recently fetched entries of an endpoint, oldest first, to warm the memory cache.
+        """
+        if not self.db:
+            return []
+        return await asyncio.to_thread(self._select_recent, endpoint, limit)
+
+    def _select_recent(self, endpoint: str, limit: int) -> list[tuple[str, dict, datetime]]:
+        with self.lock:
+            rows = self.db.execute("SELECT name, data, fetched_at FROM entries WHERE endpoint = ? "
+                                   "ORDER BY fetched_at DESC LIMIT ?", (endpoint, limit)).fetchall()
+        return [(name, json.loads(data), datetime.fromtimestamp(fetched_at)) for name, data, fetched_at in reversed(rows)]
+
+    async def flush(self) -> None:
+        """
+        It writes all pending entries in a single transaction.
+        If the write fails (e.g. the database stayed locked by another process), the batch is queued again
+        for the next flush, behind the entries queued meanwhile since those are newer.
+        """
+        if not self.pending or not self.db:
+            return
+        self.flushing, self.pending = self.pending, {}
+        try:
+            await asyncio.to_thread(self._write, self.flushing)
+        except sqlite3.Error:
+            self.pending = {**self.flushing, **self.pending}
+            raise
+        finally:
+            self.flushing = {}
+
+    def _write(self, batch: dict[tuple[str, str], tuple[dict, datetime]]) -> None:
+        rows = [(endpoint, name, json.dumps(data), fetched_at.timestamp())
+                for (endpoint, name), (data, fetched_at) in batch.items()]
+        with self.lock:
+            self.db.executemany("INSERT OR REPLACE INTO entries (endpoint, name, data, fetched_at) VALUES (?, ?, ?, ?)", rows)
+            self.db.commit()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except sqlite3.Error as e:
+                logger.error("Disk cache flush failed", extra={"error": str(e)})
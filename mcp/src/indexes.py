@@ -0,0 +1,63 @@
+"""
+Reverse indexes: move -> Pokemon that learn it, ability -> Pokemon that have it, type -> Pokemon of that type.
+
+The move, ability and type records already list all their Pokemon, so each index entry is filled lazily
+the first time it is asked for, through the client (and its caches), or all at once from the snapshot in offline mode.
+Index entries only keep names, so they stay available after the full record is evicted from the client caches.
+"""
+
+import logging
+from .client import pokeapi_client
+from .snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+class ReverseIndex:
+    """
+    In-memory inverted indexes with paginated queries.
+    """
+    def __init__(self):
+        self.move_learners: dict[str, tuple[str, ...]] = {}
+        self.ability_holders: dict[str, tuple[str, ...]] = {}
+        self.type_members: dict[str, tuple[str, ...]] = {}
+
+    def add(self, resource: str, record: tuple) -> None:
+        """
+        It indexes the Pokemon listed by a move, ability or type record.
+        """
+        if resource == "move":
+            self.move_learners[record.name] = record.learned_by
+        elif resource == "ability":
+            self.ability_holders[record.name] = record.pokemon
+        elif resource == "type":
+            self.type_members[record.name] = record.pokemon
+
+    def bulk_load(self, snapshot: Snapshot) -> None:
+        """
+        It indexes every move, ability and type of a snapshot.
+        """
+        for resource in ("move", "ability", "type"):
+            for name in snapshot.names(resource):
+                self.add(resource, snapshot.get(resource, name))
+        logger.info("Reverse indexes loaded", extra={"moves": len(self.move_learners),
+                                                     "abilities": len(self.ability_holders),
+                                                     "types": len(self.type_members)})
+
+    async def _lookup(self, index: dict[str, tuple[str, ...]], resource: str, getter, name: str) -> tuple[str, tuple[str, ...]]:
+        key = name.lower().strip().replace(" ", "-")
+        if key not in index:
+            record = await getter(name)
+            self.add(resource, record)
+            key = record.name
+        return key, index[key]
+
+    async def move_learners_of(self, name: str) -> tuple[str, tuple[str, ...]]:
+        return await self._lookup(self.move_learners, "move", pokeapi_client.get_move_raw, name)
+
+    async def ability_holders_of(self, name: str) -> tuple[str, tuple[str, ...]]:
+        return await self._lookup(self.ability_holders, "ability", pokeapi_client.get_ability_raw, name)
+
+    async def type_members_of(self, name: str) -> tuple[str, tuple[str, ...]]:
+        return await self._lookup(self.type_members, "type", pokeapi_client.get_type_raw, name)
+
+reverse_index = ReverseIndex()
@@ -3,20 +3,35 @@ Main entry point for the server.
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import logging
+import os
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 from .client import pokeapi_client
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from .tools import mcp
+from .indexes import reverse_index
+from .observability import ClientCollector, setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+REGISTRY.register(ClientCollector(pokeapi_client))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     It manages the application lifecycle    
+    The shared cache is reopened on startup (if configured), so restarts keep their warm cache.
+    With snapshot_path set, the server runs offline from a prebuilt snapshot.
     """
-    print("Server starting")
+    logger.info("Server starting")
+    await pokeapi_client.start(os.getenv("cache_db_path"), os.getenv("snapshot_path"), os.getenv("cache_redis_url"))
+    if pokeapi_client.snapshot:
+        reverse_index.bulk_load(pokeapi_client.snapshot)
+    pokeapi_client.load_name_indexes_in_background()
     async with mcp.session_manager.run():
         yield
-    print("Server stopping")
+    logger.info("Server stopping")
     await pokeapi_client.stop()
 
 app = FastAPI(title="MCP Server for PokeAPI", description="MCP server providing Pokemon data from PokeAPI",
@@ -26,6 +41,14 @@ app = FastAPI(title="MCP Server for PokeAPI", description="MCP server providing
 async def root():
     return {"status": "MCP Server running", "mcp_endpoint": "/mcp"}
 
+@app.get("/stats")
+async def stats():
+    return pokeapi_client.get_stats()
+
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 mcp_app = mcp.streamable_http_app()
 mcp_app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 app.mount("", mcp_app)
\ No newline at end of file
@@ -1,11 +1,15 @@
 """
 These models define the clean data we return to the LLM.
 The raw PokeAPI responses get transformed into these.
-We divide the models per type of information we cn get form the API """
+We divide the models per type of information we cn get form the API
 
-from pydantic import BaseModel
+They are plain slotted dataclasses: the transformers already build them from typed records, so there
+is nothing to validate, and orjson serializes them directly without a model_dump() pass. """
 
-class PokemonBasic(BaseModel):
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class PokemonBasic:
     """
     The six basic stats every Pokemon has.
     """
@@ -16,7 +20,8 @@ class PokemonBasic(BaseModel):
     special_defense: int
     speed: int
 
-class PokemonInfo(BaseModel):
+@dataclass(slots=True)
+class PokemonInfo:
     """
     All relevant Pokemon information we can get from a single request.
     """
@@ -28,7 +33,8 @@ class PokemonInfo(BaseModel):
     weight_kg: float
     stats: PokemonBasic
 
-class PokemonMoveList(BaseModel):
+@dataclass(slots=True)
+class PokemonMoveList:
     """
     List of moves a Pokemon can learn.
     """
@@ -36,7 +42,8 @@ class PokemonMoveList(BaseModel):
     total_moves: int
     moves: list[str]
 
-class Move(BaseModel):
+@dataclass(slots=True)
+class Move:
     """
     Information about a specific move.
     """
@@ -48,7 +55,8 @@ class Move(BaseModel):
     damage_class: str
     effect: str
 
-class TypeEffectiveness(BaseModel):
+@dataclass(slots=True)
+class TypeEffectiveness:
     """
     Type matchup information.
     """
@@ -60,10 +68,37 @@ class TypeEffectiveness(BaseModel):
     half_damage_from: list[str]
     no_damage_from: list[str]
 
-class Ability(BaseModel):
+@dataclass(slots=True)
+class Ability:
     """
     Information about an ability.
     """
     name: str
     effect: str
     pokemon_with_ability: list[str]
+
+@dataclass(slots=True)
+class Matchup:
+    """
+    Damage multiplier of an attacking type against a defender (e.g. "water/ground").
+    """
+    attacking: str
+    defending: str
+    multiplier: float
+
+@dataclass(slots=True)
+class MatchupTable:
+    """
+    All the matchups between the requested attacking types and defenders.
+    """
+    matchups: list[Matchup]
+
+@dataclass(slots=True)
+class PokemonPage:
+    """
+    One page of the Pokemon related to a move, ability or type.
+    """
+    name: str
+    total: int
+    offset: int
+    pokemon: list[str]
@@ -0,0 +1,55 @@
+"""
+Name indexes of all pokemon, move, type and ability names.
+
+They let the client resolve names locally before going to the API: spelling variants such as
+"thunder bolt" or "mr mime" are mapped to the real name, and names that don't exist are rejected
+right away with "did you mean" candidates, found with a trigram index and ranked by edit similarity,
+instead of paying a round trip that ends in a 404.
+"""
+
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+def _squash(name: str) -> str:
+    """
+    It removes separators, so "thunder bolt", "thunder-bolt" and "thunderbolt" compare equal.
+    """
+    return name.replace("-", "").replace(" ", "")
+
+def _trigrams(name: str) -> set[str]:
+    padded = f"  {_squash(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """
+    All names of one endpoint, with trigram lookup for suggestions.
+    """
+    def __init__(self, names: list[str]):
+        self.names = set(names)
+        self.squashed = {_squash(name): name for name in names}
+        self.trigrams: dict[str, set[str]] = defaultdict(set)
+        for name in names:
+            for trigram in _trigrams(name):
+                self.trigrams[trigram].add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, key: str) -> str | None:
+        """
+        It returns the real name for a key, or None if there is no such name.
+        """
+        if key in self.names:
+            return key
+        return self.squashed.get(_squash(key))
+
+    def suggest(self, key: str, limit: int = 3) -> list[str]:
+        """
+        It returns the names closest to a misspelled key, best first.
+        """
+        shared = Counter()
+        for trigram in _trigrams(key):
+            shared.update(self.trigrams.get(trigram, ()))
+        candidates = [name for name, _ in shared.most_common(20)]
+        scored = sorted(((SequenceMatcher(None, key, name).ratio(), name) for name in candidates), reverse=True)
+        return [name for score, name in scored[:limit] if score >= 0.6]
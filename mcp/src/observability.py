@@ -0,0 +1,118 @@
+"""
+Metrics and logs.
+
+Prometheus metrics are exposed on /metrics: tool latency, upstream PokeAPI fetch latency by status and,
+read from the client when scraped, the counters of every cache (hits, misses, evictions, ...).
+Logs are JSON lines with the fields passed as extra, and routine (below WARNING) logs can be sampled
+with log_sample_rate to keep their volume down under load.
+"""
+
+import functools
+import json
+import logging
+import os
+import random
+import time
+from prometheus_client import Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+tool_seconds = Histogram("mcp_tool_seconds", "Latency of the MCP tools", ["tool", "outcome"])
+upstream_fetch_seconds = Histogram("mcp_upstream_fetch_seconds", "Latency of the PokeAPI requests",
+                                   ["resource", "status"])
+
+def instrumented(tool):
+    """
+    It records the latency of a tool, and if it returned an error.
+    It keeps the signature of the tool, so FastMCP still builds the same input schema.
+    """
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await tool(*args, **kwargs)
+            # Results are serialized JSON, errors are the objects starting with an "error" key
+            outcome = "error" if result.startswith('{"error"') else "ok"
+            return result
+        finally:
+            tool_seconds.labels(tool.__name__, outcome).observe(time.perf_counter() - start)
+    return wrapper
+
+class ClientCollector:
+    """
+    It exports the client statistics on every scrape, so the hot path doesn't update any metric for them.
+    """
+    counters = ("upstream_fetches", "coalesced_fetches", "shared_hits", "names_rejected", "revalidations", "not_modified",
+                "retries", "hedged_requests", "queue_timeouts", "prefetches", "prefetches_skipped")
+    cache_counters = ("hits", "stale_hits", "misses", "evictions", "expirations", "prefetch_hits", "prefetch_wasted")
+    cache_gauges = ("entries", "bytes", "max_bytes")
+
+    def __init__(self, client):
+        self.client = client
+
+    def collect(self):
+        stats = self.client.get_stats()
+        for name in self.counters:
+            counter = CounterMetricFamily(f"mcp_client_{name}", f"PokeAPI client {name.replace('_', ' ')}")
+            counter.add_metric([], stats[name])
+            yield counter
+        in_flight = GaugeMetricFamily("mcp_client_in_flight", "PokeAPI requests in flight")
+        in_flight.add_metric([], stats["in_flight"])
+        yield in_flight
+        limit = GaugeMetricFamily("mcp_client_upstream_limit", "Adaptive limit of concurrent PokeAPI requests")
+        limit.add_metric([], stats["upstream_limit"])
+        yield limit
+        circuit = GaugeMetricFamily("mcp_client_circuit_open", "1 while the PokeAPI circuit breaker is open")
+        circuit.add_metric([], stats["circuit"] == "open")
+        yield circuit
+
+        for group, prefix in (("caches", "mcp_cache"), ("not_found_caches", "mcp_not_found_cache")):
+            for name in self.cache_counters:
+                counter = CounterMetricFamily(f"{prefix}_{name}", f"Cache {name.replace('_', ' ')}", labels=["cache"])
+                for cache, cache_stats in stats[group].items():
+                    counter.add_metric([cache], cache_stats[name])
+                yield counter
+            for name in self.cache_gauges:
+                gauge = GaugeMetricFamily(f"{prefix}_{name}", f"Cache {name.replace('_', ' ')}", labels=["cache"])
+                for cache, cache_stats in stats[group].items():
+                    gauge.add_metric([cache], cache_stats[name])
+                yield gauge
+
+# Attributes every log record has, everything else was passed as extra
+_record_fields = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with the extra fields of the record.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                 "message": record.getMessage()}
+        entry.update({key: value for key, value in vars(record).items() if key not in _record_fields})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    It keeps only a share of the records below WARNING. Warnings and errors are always kept.
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+def setup_logging() -> None:
+    """
+    It sends all logs to stderr as sampled JSON lines. Configured with log_level and log_sample_rate.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(SamplingFilter(float(os.getenv("log_sample_rate", 1.0))))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(os.getenv("log_level", "INFO").upper())
+    # httpx logs every request at INFO, that is what the metrics are for
+    logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -0,0 +1,72 @@
+"""
+Full Pokedex listing.
+
+The whole /pokemon listing (about 1300 entries of id and name) is fetched once, with concurrent pages,
+and kept in memory by the client. Paging and filtering by name prefix or id range then run locally,
+as generators over the sorted entries, so a listing question never needs the network after warm-up
+and only the requested page is ever materialized.
+"""
+
+import bisect
+from collections.abc import Iterator
+from itertools import islice
+from typing import NamedTuple
+
+class PokedexEntry(NamedTuple):
+    id: int
+    name: str
+
+def _id_from_url(url: str | None, default: int) -> int:
+    """
+    It reads the id at the end of a listing url, e.g. ".../pokemon/25/" -> 25.
+    """
+    tail = (url or "").rstrip("/").rsplit("/", 1)[-1]
+    return int(tail) if tail.isdigit() else default
+
+class Pokedex:
+    """
+    All Pokemon sorted by id.
+    """
+    def __init__(self, entries: list[PokedexEntry]):
+        self.entries = sorted(entries)
+        self.ids = [entry.id for entry in self.entries]
+
+    @classmethod
+    def from_listing(cls, results: list[dict]) -> "Pokedex":
+        """
+        It builds the Pokedex from the results of the listing endpoint, in listing order.
+        """
+        return cls([PokedexEntry(_id_from_url(item.get("url"), position), item["name"])
+                    for position, item in enumerate(results, 1)])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> list[str]:
+        return [entry.name for entry in self.entries]
+
+    def filter(self, prefix: str | None = None, min_id: int | None = None, max_id: int | None = None) -> Iterator[PokedexEntry]:
+        """
+        It yields the entries matching the filters, lazily and in id order.
+        The id range is found by bisection, so only the entries inside it are looked at.
+        """
+        start = bisect.bisect_left(self.ids, min_id) if min_id is not None else 0
+        end = bisect.bisect_right(self.ids, max_id) if max_id is not None else len(self.ids)
+        entries = islice(self.entries, start, end)
+        if prefix:
+            prefix = prefix.lower().strip()
+            return (entry for entry in entries if entry.name.startswith(prefix))
+        return entries
+
+    def page(self, limit: int, offset: int, prefix: str | None = None, min_id: int | None = None,
+             max_id: int | None = None) -> tuple[int, list[PokedexEntry]]:
+        """
+        It returns how many entries match the filters and one page of them, in a single pass.
+        """
+        matches = self.filter(prefix, min_id, max_id)
+        page = list(islice(matches, offset, offset + limit))
+        if not page:
+            # The offset is past the end, so the skipped entries are counted again
+            return sum(1 for _ in self.filter(prefix, min_id, max_id)), page
+        # The rest of the same generator is only counted, never stored
+        return offset + len(page) + sum(1 for _ in matches), page
@@ -0,0 +1,123 @@
+"""
+Compact projections of the raw PokeAPI responses.
+
+Raw responses are big (a single /pokemon payload carries sprites, game indices and the version details of every move),
+while the transformers only read a few fields. The client therefore caches these tuple-backed records instead,
+keeping only what transformers.py and the reverse indexes (indexes.py) consume. Names shared between many records (types, abilities, moves)
+are interned, so the whole Pokedex can be kept in memory.
+"""
+
+import sys
+from typing import NamedTuple
+
+class PokemonRecord(NamedTuple):
+    """
+    Fields of /pokemon/{name} used by get_pokemon and get_pokemon_moves.
+    Stats are kept in the order hp, attack, defense, special-attack, special-defense, speed.
+    """
+    name: str
+    id: int
+    types: tuple[str, ...]
+    abilities: tuple[str, ...]
+    stats: tuple[int, ...]
+    height: int
+    weight: int
+    moves: tuple[str, ...]
+
+class MoveRecord(NamedTuple):
+    """
+    Fields of /move/{name} used by get_move, plus the Pokemon that learn it.
+    """
+    name: str
+    type: str
+    power: int | None
+    accuracy: int | None
+    pp: int
+    damage_class: str
+    effect: str
+    learned_by: tuple[str, ...]
+
+class TypeRecord(NamedTuple):
+    """
+    Damage relations of /type/{name} used by get_type, plus the Pokemon of this type.
+    """
+    name: str
+    double_damage_to: tuple[str, ...]
+    half_damage_to: tuple[str, ...]
+    no_damage_to: tuple[str, ...]
+    double_damage_from: tuple[str, ...]
+    half_damage_from: tuple[str, ...]
+    no_damage_from: tuple[str, ...]
+    pokemon: tuple[str, ...]
+
+class AbilityRecord(NamedTuple):
+    """
+    Fields of /ability/{name} used by get_ability.
+    """
+    name: str
+    effect: str
+    pokemon: tuple[str, ...]
+
+stat_names = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+damage_relations = ("double_damage_to", "half_damage_to", "no_damage_to",
+                    "double_damage_from", "half_damage_from", "no_damage_from")
+
+def _names(items: list, field: str) -> tuple[str, ...]:
+    """
+    It collects the interned names of a list of {field: {"name": ...}} items.
+    """
+    return tuple(sys.intern(item[field]["name"]) for item in items)
+
+def _english_effect(raw: dict) -> str:
+    """
+    It returns the full English effect description, if there is one.
+    """
+    for entry in raw.get("effect_entries", []):
+        if entry["language"]["name"] == "en":
+            return entry.get("effect", "No description available.")  # We are skipping the short effect
+    return "No description available."
+
+def project_pokemon(raw: dict) -> PokemonRecord:
+    stats = {stat["stat"]["name"]: stat["base_stat"] for stat in raw["stats"]}
+    return PokemonRecord(name=sys.intern(raw["name"]), id=raw["id"], types=_names(raw["types"], "type"),
+                         abilities=_names(raw["abilities"], "ability"),
+                         stats=tuple(stats[name] for name in stat_names),
+                         height=raw["height"], weight=raw["weight"], moves=_names(raw["moves"], "move"))
+
+def project_move(raw: dict) -> MoveRecord:
+    return MoveRecord(name=sys.intern(raw["name"]), type=sys.intern(raw["type"]["name"]), power=raw["power"],
+                      accuracy=raw["accuracy"], pp=raw["pp"], damage_class=sys.intern(raw["damage_class"]["name"]),
+                      effect=_english_effect(raw),
+                      learned_by=tuple(sys.intern(pokemon["name"]) for pokemon in raw.get("learned_by_pokemon", [])))
+
+def project_type(raw: dict) -> TypeRecord:
+    relations = raw["damage_relations"]
+    return TypeRecord(name=sys.intern(raw["name"]),
+                      **{relation: tuple(sys.intern(t["name"]) for t in relations[relation])
+                         for relation in damage_relations},
+                      pokemon=_names(raw.get("pokemon", []), "pokemon"))
+
+def project_ability(raw: dict) -> AbilityRecord:
+    return AbilityRecord(name=sys.intern(raw["name"]), effect=_english_effect(raw),
+                         pokemon=_names(raw.get("pokemon", []), "pokemon"))
+
+projectors = {"pokemon": project_pokemon, "move": project_move, "type": project_type, "ability": project_ability}
+record_types = {"pokemon": PokemonRecord, "move": MoveRecord, "type": TypeRecord, "ability": AbilityRecord}
+
+def is_current(resource: str, data: dict | list) -> bool:
+    """
+    It tells if stored data can be turned into the current record of an endpoint.
+    Records stored before a field was added are outdated and must be fetched again.
+    """
+    return isinstance(data, dict) or len(data) == len(record_types[resource]._fields)
+
+def to_record(resource: str, data: dict | list) -> tuple:
+    """
+    It builds the record of an endpoint from either a raw API response (dict)
+    or a stored record, which JSON turns into a list of values.
+    """
+    if isinstance(data, dict):
+        return projectors[resource](data)
+    values = (tuple(sys.intern(v) if isinstance(v, str) else v for v in value) if isinstance(value, list) else value
+              for value in data)
+    return record_types[resource](*values)
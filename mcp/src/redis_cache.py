@@ -0,0 +1,158 @@
+"""
+Redis-backed second level cache for PokeAPI responses, shared by every MCP server of the fleet.
+
+It has the same interface as the SQLite cache (see disk_cache.py), so the client uses either one below its
+in-memory near caches: a record fetched by any worker or replica is then a hit for all the others,
+and the hit ratio grows with the number of servers instead of being split between them.
+Writes are write-behind, flushed in batches with one pipelined round trip, so a cache miss never waits on Redis.
+
+Entries are stored as "pokeapi:{endpoint}:{name}" strings expiring after entry_ttl seconds, and a sorted set
+per endpoint ranks them by fetch time so a starting server can warm up with the most recent ones.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+class RedisCache:
+    """
+    Shared cache stored in Redis.
+    """
+    flush_interval = 1.0
+    # Entries not refreshed for a week are dropped, revalidation keeps the used ones alive
+    entry_ttl = 7 * 24 * 3600
+    # Size of the per endpoint ranking of recent entries
+    recent_max = 5000
+
+    def __init__(self, url: str):
+        self.url = url
+        self.redis: redis.Redis | None = None
+        self.pending: dict[tuple[str, str], tuple[dict, datetime]] = {}
+        # The batch currently being written, still readable until the write is done
+        self.flushing: dict[tuple[str, str], tuple[dict, datetime]] = {}
+        self.flush_task: asyncio.Task | None = None
+
+    def _key(self, endpoint: str, name: str) -> str:
+        return f"pokeapi:{endpoint}:{name}"
+
+    def _recent_key(self, endpoint: str) -> str:
+        return f"pokeapi:recent:{endpoint}"
+
+    async def open(self) -> None:
+        """
+        It connects to Redis and starts the write-behind task.
+        It raises ConnectionError if Redis can't be reached, the server then runs without the shared cache.
+        """
+        self.redis = redis.from_url(self.url)
+        try:
+            await self.redis.ping()
+        except redis.RedisError as e:
+            await self.redis.aclose()
+            self.redis = None
+            raise ConnectionError(f"Redis cache unreachable: {e}") from e
+        self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """
+        It stops the write-behind task, writes what is still pending and closes the connections.
+        A failing last write is logged and the entries are lost, the connections are closed anyway.
+        """
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        if self.redis:
+            try:
+                await self.flush()
+            except redis.RedisError as e:
+                logger.error("Redis cache flush failed on close",
+                             extra={"error": str(e), "entries_lost": len(self.pending)})
+            finally:
+                await self.redis.aclose()
+                self.redis = None
+                self.pending = {}
+
+    def _decode(self, value: bytes) -> tuple[dict, datetime]:
+        stored = json.loads(value)
+        return stored["data"], datetime.fromtimestamp(stored["fetched_at"])
+
+    async def get(self, endpoint: str, name: str) -> tuple[dict, datetime] | None:
+        """
+        It returns the stored data and its fetch time, or None if the entry is not in Redis.
+        Redis being unreachable counts as a miss, so lookups fall back to the API.
+        """
+        queued = self.pending.get((endpoint, name)) or self.flushing.get((endpoint, name))
+        if queued:
+            return queued
+        if not self.redis:
+            return None
+        try:
+            value = await self.redis.get(self._key(endpoint, name))
+        except redis.RedisError as e:
+            logger.warning("Redis cache read failed", extra={"error": str(e)})
+            return None
+        return self._decode(value) if value else None
+
+    def put(self, endpoint: str, name: str, data: dict, fetched_at: datetime) -> None:
+        """
+        It queues an entry to be written by the next flush.
+        """
+        self.pending[(endpoint, name)] = (data, fetched_at)
+
+    async def load_recent(self, endpoint: str, limit: int) -> list[tuple[str, dict, datetime]]:
+        """
+        It returns the most recently fetched entries of an endpoint, oldest first, to warm the memory cache.
+        A failing read only means a colder start, nothing is returned then.
+        """
+        if not self.redis:
+            return []
+        try:
+            names = [name.decode() for name in await self.redis.zrevrange(self._recent_key(endpoint), 0, limit - 1)]
+            if not names:
+                return []
+            values = await self.redis.mget([self._key(endpoint, name) for name in names])
+        except redis.RedisError as e:
+            logger.warning("Redis cache warm up failed", extra={"endpoint": endpoint, "error": str(e)})
+            return []
+        # Entries that expired are still ranked until the ranking is trimmed, they are skipped
+        return [(name, *self._decode(value)) for name, value in reversed(list(zip(names, values))) if value]
+
+    async def flush(self) -> None:
+        """
+        It writes all pending entries in a single pipelined round trip.
+        If the write fails, the batch is queued again for the next flush, behind the newer entries queued meanwhile.
+        """
+        if not self.pending or not self.redis:
+            return
+        self.flushing, self.pending = self.pending, {}
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                recent: dict[str, dict[str, float]] = {}
+                for (endpoint, name), (data, fetched_at) in self.flushing.items():
+                    value = json.dumps({"data": data, "fetched_at": fetched_at.timestamp()})
+                    pipe.set(self._key(endpoint, name), value, ex=self.entry_ttl)
+                    recent.setdefault(endpoint, {})[name] = fetched_at.timestamp()
+                for endpoint, scores in recent.items():
+                    pipe.zadd(self._recent_key(endpoint), scores)
+                    pipe.zremrangebyrank(self._recent_key(endpoint), 0, -self.recent_max - 1)
+                await pipe.execute()
+        except redis.RedisError:
+            self.pending = {**self.flushing, **self.pending}
+            raise
+        finally:
+            self.flushing = {}
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except redis.RedisError as e:
+                logger.error("Redis cache flush failed", extra={"error": str(e)})
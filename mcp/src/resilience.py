@@ -0,0 +1,149 @@
+"""
+Protection of the upstream calls.
+
+- AdaptiveLimiter caps the PokeAPI requests in flight. The cap grows slowly while requests succeed quickly
+  and is halved on throttling, server errors, timeouts or slow answers (AIMD, as in TCP congestion control),
+  so bursts queue here instead of getting the server throttled upstream.
+- retry_delay gives the wait before retrying a 429/5xx: exponential backoff with full jitter, or the
+  Retry-After the API asked for. A Retry-After longer than what is left of the budget is not shortened:
+  the request fails and the circuit is opened until then, so no request is sent before the API allows it.
+- CircuitBreaker stops calling an upstream that keeps failing: calls fail fast while it is open (the client
+  keeps serving stale cache entries), then a single probe decides if it closes again.
+- The client gives each upstream request a total time budget, shared by the limiter wait, the attempts and the
+  backoff sleeps, and raises UpstreamTimeoutError once it is used up, or UpstreamBusyError if the request
+  was still queued for the limiter then.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+class CircuitOpenError(ValueError):
+    """
+    The upstream is considered down, the request was not sent.
+    """
+
+class UpstreamTimeoutError(ValueError):
+    """
+    The upstream did not answer within the time budget of the lookup, retries included.
+    """
+
+class UpstreamBusyError(ValueError):
+    """
+    The request waited for a slot of the concurrency limit until its budget ran out, it was never sent.
+    This is local overload, not an upstream failure, so it doesn't count towards opening the circuit.
+    """
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted with additive increase / multiplicative decrease.
+    """
+    def __init__(self, initial: int = 16, minimum: int = 2, maximum: int = 64, latency_target: float = 2.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        # Answers slower than this (seconds) count as a sign of overload
+        self.latency_target = latency_target
+        self.in_use = 0
+        self.available = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self.available:
+            while self.in_use >= int(self.limit):
+                await self.available.wait()
+            self.in_use += 1
+
+    async def release(self, latency: float, overloaded: bool) -> None:
+        """
+        It frees a slot and adapts the limit to how the request went.
+        """
+        async with self.available:
+            self.in_use -= 1
+            if overloaded or latency > self.latency_target:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                # About +1 once a full window of requests succeeded
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.available.notify_all()
+
+def retry_delay(attempt: int, retry_after: str | None, base: float = 0.1, cap: float = 5.0) -> float:
+    """
+    It returns the seconds to wait after the given failed attempt (counted from 0) before retrying.
+    A Retry-After header (seconds or HTTP date) wins over the backoff and is returned as it is, only the backoff is capped.
+    """
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            return max(0.0, seconds)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    It opens after failure_threshold consecutive failures and lets one probe through after reset_timeout seconds.
+    trip opens it right away for a given time, e.g. the Retry-After of a throttled answer.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        # How long it stays open before the probe, longer than reset_timeout when tripped
+        self.open_for = reset_timeout
+        # When the running probe was let through, a probe that never reported is replaced after reset_timeout
+        self.probe_at: float | None = None
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.open_for:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """
+        It tells if a request may be sent. While half open only one probe is sent at a time.
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        now = time.monotonic()
+        if state == "half_open" and (self.probe_at is None or now - self.probe_at > self.reset_timeout):
+            self.probe_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probe_at = None
+        self.open_for = self.reset_timeout
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        probe_failed = self.probe_at is not None
+        if probe_failed or self.failures >= self.failure_threshold:
+            if self.opened_at is None or probe_failed:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+            self.open_for = self.reset_timeout
+            self.probe_at = None
+
+    def trip(self, seconds: float) -> None:
+        """
+        It opens the circuit for at least the given seconds.
+        """
+        if self.opened_at is None:
+            self.times_opened += 1
+        self.opened_at = time.monotonic()
+        self.open_for = max(self.reset_timeout, seconds)
+        self.probe_at = None
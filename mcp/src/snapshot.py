@@ -0,0 +1,138 @@
+"""
+Offline snapshot of PokeAPI: all pokemon, moves, types and abilities in one compact indexed file.
+
+The server can read every tool answer from a snapshot instead of calling pokeapi.co,
+so it no longer depends on the upstream availability or rate limits.
+The file is memory mapped and only the index is parsed on open, records are decoded on demand.
+
+File layout:
+    - magic (8 bytes) + index offset and length (two 8 byte little endian integers)
+    - records, each one a JSON list of the record values (see projections.py)
+    - index: JSON object {endpoint: {name: [offset, length, id]}}, names in PokeAPI listing order
+
+The snapshot is built by crawling the API (from the mcp folder):
+    python -m src.snapshot pokedex.snap
+"""
+
+import asyncio
+import json
+import mmap
+import struct
+import sys
+import httpx
+from .projections import is_current, to_record
+
+magic = b"PKSNAP1\n"
+header = struct.Struct("<8sQQ")
+resources = ("pokemon", "move", "type", "ability")
+
+class Snapshot:
+    """
+    Read-only access to a snapshot file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        file_magic, index_offset, index_length = header.unpack_from(self.data, 0)
+        if file_magic != magic:
+            self.close()
+            raise ValueError(f"{path} is not a PokeAPI snapshot")
+        self.index: dict[str, dict[str, list[int]]] = json.loads(self.data[index_offset:index_offset + index_length])
+        # Numeric ids to names, so get_pokemon("25") works offline as it does online
+        self.ids = {resource: {str(location[2]): name for name, location in entries.items() if len(location) > 2}
+                    for resource, entries in self.index.items()}
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+    def get(self, resource: str, name: str) -> tuple | None:
+        """
+        It returns the record of a resource by name or numeric id, or None if the snapshot doesn't have it.
+        """
+        if name.isdigit():
+            name = self.ids.get(resource, {}).get(name, name)
+        location = self.index.get(resource, {}).get(name)
+        if location is None:
+            return None
+        offset, length = location[:2]
+        data = json.loads(self.data[offset:offset + length])
+        if not is_current(resource, data):
+            raise ValueError(f"Snapshot {self.path} is outdated, it needs to be built again")
+        return to_record(resource, data)
+
+    def names(self, resource: str) -> list[str]:
+        """
+        It returns all the names of an endpoint in listing order.
+        """
+        return list(self.index.get(resource, {}))
+
+class SnapshotWriter:
+    """
+    It writes records one by one and the index at the end.
+    """
+    def __init__(self, path: str):
+        self.file = open(path, "wb")
+        self.file.write(header.pack(magic, 0, 0))
+        self.index: dict[str, dict[str, list[int]]] = {resource: {} for resource in resources}
+
+    def add(self, resource: str, record: tuple, resource_id: int | None = None) -> None:
+        """
+        It writes a record. Its id is indexed too, taken from the record when it has one.
+        """
+        encoded = json.dumps(record, separators=(",", ":")).encode()
+        resource_id = resource_id if resource_id is not None else getattr(record, "id", None)
+        location = [self.file.tell(), len(encoded)]
+        self.index[resource][record.name] = location if resource_id is None else [*location, resource_id]
+        self.file.write(encoded)
+
+    def close(self) -> None:
+        index_offset = self.file.tell()
+        encoded = json.dumps(self.index, separators=(",", ":")).encode()
+        self.file.write(encoded)
+        self.file.seek(0)
+        self.file.write(header.pack(magic, index_offset, len(encoded)))
+        self.file.close()
+
+async def build_snapshot(path: str, api_base: str = "https://pokeapi.co/api/v2", concurrency: int = 20,
+                         retries: int = 3) -> None:
+    """
+    It crawls every endpoint of the API and writes all the records to a snapshot file.
+    Network errors are retried a few times with backoff, resources that still can't be fetched are skipped and reported.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    writer = SnapshotWriter(path)
+
+    async with httpx.AsyncClient(timeout=30.0) as http_client:
+
+        async def fetch(url: str) -> dict | None:
+            for attempt in range(retries + 1):
+                try:
+                    async with semaphore:
+                        response = await http_client.get(url)
+                    break
+                except httpx.TransportError as e:
+                    if attempt == retries:
+                        print(f"Skipping {url}: {e!r}")
+                        return None
+                    await asyncio.sleep(2 ** attempt)
+            if response.status_code != 200:
+                print(f"Skipping {url}: {response.status_code}")
+                return None
+            return response.json()
+
+        for resource in resources:
+            listing = await http_client.get(f"{api_base}/{resource}", params={"limit": 100000})
+            listing.raise_for_status()
+            names = [item["name"] for item in listing.json()["results"]]
+            raws = await asyncio.gather(*[fetch(f"{api_base}/{resource}/{name}") for name in names])
+            for raw in raws:
+                if raw is not None:
+                    writer.add(resource, to_record(resource, raw), raw["id"])
+            print(f"{resource}: {len(writer.index[resource])} of {len(names)}")
+
+    writer.close()
+
+if __name__ == "__main__":
+    asyncio.run(build_snapshot(sys.argv[1] if len(sys.argv) > 1 else "pokedex.snap"))
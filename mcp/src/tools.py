@@ -1,77 +1,212 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import orjson
 from mcp.server.fastmcp import FastMCP
-from .client import pokeapi_client
+from .client import pokeapi_client, NotFoundError
+from .models import PokemonInfo, Move, Ability
 from .transformers import (transform_pokemon_info, transform_pokemon_moves,
                            transform_move_info, transform_type_effectiveness,
-                           transform_ability_info)
+                           transform_ability_info, transform_matchups, transform_pokemon_page)
+from .type_chart import type_chart
+from .indexes import reverse_index
+from .observability import instrumented
 
 mcp = FastMCP("MCP Server for PokeAPI", host = "0.0.0.0")
 
-@mcp.tool()
-async def get_pokemon(name: str) -> dict:
+# Batch tools accept up to batch_max names and run at most batch_concurrency lookups at a time
+batch_max = 20
+batch_concurrency = 8
+# Largest page returned by the reverse index tools
+page_max = 200
+
+def _json(result) -> str:
+    """
+    It serializes a tool result (models, dicts or lists of them) in one orjson pass.
+    Tools return this text as is, so FastMCP doesn't serialize (or duplicate as structured content) it again.
+    """
+    return orjson.dumps(result).decode()
+
+def _error(e: ValueError) -> dict:
+    """
+    It builds the error returned by a tool, with the suggested names when the resource was not found.
+    """
+    if isinstance(e, NotFoundError) and e.suggestions:
+        return {"error": str(e), "did_you_mean": e.suggestions}
+    return {"error": str(e)}
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_pokemon(name: str) -> str:
     """
     It takes as input a Pokemon name and it gets its basic info.
     """
+    return _json(await _pokemon_info(name))
+
+async def _pokemon_info(name: str) -> PokemonInfo | dict:
     try:
         raw = await pokeapi_client.get_pokemon_raw(name)
-        info = transform_pokemon_info(raw)
-        return info.model_dump()
+        return transform_pokemon_info(raw)
     except ValueError as e:
-        return {"error": str(e)}
+        return _error(e)
 
-@mcp.tool()
-async def get_pokemon_moves(name: str) -> dict:
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_pokemon_moves(name: str) -> str:
     """
     It gets the list of moves a Pokemon can learn and it returns the Pokemon name along with the list of all move names.
     We are separating it from get_pokemon because move lists are quite large.
     """
     try:
         raw = await pokeapi_client.get_pokemon_raw(name)
-        moves = transform_pokemon_moves(raw)
-        return moves.model_dump()
+        return _json(transform_pokemon_moves(raw))
     except ValueError as e:
-        return {"error": str(e)}
+        return _json(_error(e))
 
-@mcp.tool()
-async def get_move(name: str) -> dict:
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_move(name: str) -> str:
     """
     This tool gets all the info about a specific move.
     """
+    return _json(await _move_info(name))
+
+async def _move_info(name: str) -> Move | dict:
     try:
         raw = await pokeapi_client.get_move_raw(name)
-        info = transform_move_info(raw)
-        return info.model_dump()
+        return transform_move_info(raw)
     except ValueError as e:
-        return {"error": str(e)}
+        return _error(e)
 
-@mcp.tool()
-async def get_type(name: str) -> dict:
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_type(name: str) -> str:
     """
     This tool returns type effectiveness data with all damage relations.
     """
     try:
         raw = await pokeapi_client.get_type_raw(name)
-        info = transform_type_effectiveness(raw)
-        return info.model_dump()
+        return _json(transform_type_effectiveness(raw))
     except ValueError as e:
-        return {"error": str(e)}
+        return _json(_error(e))
 
-@mcp.tool()
-async def get_ability(name: str) -> dict:
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_ability(name: str) -> str:
     """
     This tool returns all the info about a certain ability.
     """
+    return _json(await _ability_info(name))
+
+async def _ability_info(name: str) -> Ability | dict:
     try:
         raw = await pokeapi_client.get_ability_raw(name)
-        info = transform_ability_info(raw)
-        return info.model_dump()
+        return transform_ability_info(raw)
     except ValueError as e:
-        return {"error": str(e)}
+        return _error(e)
 
-@mcp.tool()
-async def list_pokemon(limit: int = 20, offset: int = 0) -> dict:
-    """Get a list of Pokemon names."""
+@mcp.tool(structured_output=False)
+@instrumented
+async def list_pokemon(limit: int = 20, offset: int = 0, prefix: str | None = None,
+                       min_id: int | None = None, max_id: int | None = None) -> str:
+    """
+    Get a list of Pokemon names, optionally only those starting with prefix or with an id between min_id and max_id.
+    """
     try:
-        data = await pokeapi_client.list_pokemon(limit, offset)
-        return {"pokemon": [item["name"] for item in data["results"]]}
+        data = await pokeapi_client.list_pokemon(limit, offset, prefix, min_id, max_id)
+        names = [item["name"] for item in data["results"]]
+        next_offset = data["offset"] + len(names)
+        return _json({"count": data["count"], "pokemon": names,
+                      "next_offset": next_offset if next_offset < data["count"] else None})
     except ValueError as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return _json(_error(e))
+
+async def _batch(names: list[str], lookup: Callable[[str], Awaitable[object]]) -> str:
+    """
+    It runs a single-name tool for many names concurrently and returns one result per name, in order.
+    Failed lookups keep their name next to the error, so the other results are still usable.
+    Names past batch_max are not looked up, they are listed in "skipped" so the model can ask for them again.
+    """
+    semaphore = asyncio.Semaphore(batch_concurrency)
+
+    async def run(name: str) -> object:
+        async with semaphore:
+            result = await lookup(name)
+        return {"name": name, **result} if isinstance(result, dict) else result
+
+    results = await asyncio.gather(*[run(name) for name in names[:batch_max]])
+    if len(names) <= batch_max:
+        return _json({"results": results})
+    return _json({"results": results, "skipped": names[batch_max:],
+                  "note": f"Only the first {batch_max} names were looked up, call again for the skipped ones"})
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_pokemon_batch(names: list[str]) -> str:
+    """
+    It gets the basic info of several Pokemon in one call (e.g. a full team).
+    """
+    return await _batch(names, _pokemon_info)
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_move_batch(names: list[str]) -> str:
+    """
+    It gets the details of several moves in one call (e.g. to compare them).
+    """
+    return await _batch(names, _move_info)
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_ability_batch(names: list[str]) -> str:
+    """
+    It gets the info of several abilities in one call.
+    """
+    return await _batch(names, _ability_info)
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_matchup(attacking_types: list[str], defending_types: list[str]) -> str:
+    """
+    This tool returns the damage multiplier of every attacking type against every defender.
+    A dual-type defender is written as "water/ground".
+    """
+    try:
+        multipliers = await type_chart.matchups(attacking_types, defending_types)
+        return _json(transform_matchups(attacking_types, defending_types, multipliers))
+    except ValueError as e:
+        return _json(_error(e))
+
+async def _page(lookup: Callable[[str], Awaitable[tuple[str, tuple[str, ...]]]], name: str, limit: int, offset: int) -> str:
+    """
+    It runs a reverse index lookup and returns one page of the Pokemon found.
+    """
+    try:
+        key, pokemon = await lookup(name)
+        page = transform_pokemon_page(key, pokemon, max(1, min(limit, page_max)), max(0, offset))
+        return _json(page)
+    except ValueError as e:
+        return _json(_error(e))
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_move_learners(name: str, limit: int = 50, offset: int = 0) -> str:
+    """
+    This tool returns the Pokemon that can learn a move, one page at a time.
+    """
+    return await _page(reverse_index.move_learners_of, name, limit, offset)
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_ability_pokemon(name: str, limit: int = 50, offset: int = 0) -> str:
+    """
+    This tool returns all the Pokemon that can have an ability, one page at a time.
+    """
+    return await _page(reverse_index.ability_holders_of, name, limit, offset)
+
+@mcp.tool(structured_output=False)
+@instrumented
+async def get_type_pokemon(name: str, limit: int = 50, offset: int = 0) -> str:
+    """
+    This tool returns all the Pokemon of a type, one page at a time.
+    """
+    return await _page(reverse_index.type_members_of, name, limit, offset)
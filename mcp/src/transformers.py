@@ -1,73 +1,70 @@
 """
 Transformers keeps extraction logic separate from HTTP logic and
-each transformer takes raw PokeAPI data and etracts relevant fields into a clean Pydantic model.
+each transformer takes PokeAPI data and turns the relevant fields into a clean model (see models.py).
+They accept either the compact records cached by the client (see projections.py) or raw API responses.
 """
 
 from .models import (PokemonInfo, PokemonBasic, PokemonMoveList,
-                    Move, TypeEffectiveness, Ability)
+                    Move, TypeEffectiveness, Ability, Matchup, MatchupTable, PokemonPage)
+from .projections import (PokemonRecord, MoveRecord, TypeRecord, AbilityRecord, damage_relations,
+                          project_pokemon, project_move, project_type, project_ability)
 
-def transform_pokemon_info(raw: dict) -> PokemonInfo:
+def transform_pokemon_info(raw: PokemonRecord | dict) -> PokemonInfo:
     """
     It transforms raw pokemon info into a PokemonInfo model.
     """
+    pokemon = raw if isinstance(raw, PokemonRecord) else project_pokemon(raw)
+    hp, attack, defense, special_attack, special_defense, speed = pokemon.stats
 
-    types = [t["type"]["name"] for t in raw["types"]]
-    abilities = [a["ability"]["name"] for a in raw["abilities"]]
-    stats_dict = {stat["stat"]["name"]: stat["base_stat"] for stat in raw["stats"]}
-    
-    stats = PokemonBasic(hp=stats_dict["hp"], attack=stats_dict["attack"],
-                         defense=stats_dict["defense"],
-                         special_attack=stats_dict["special-attack"],
-                         special_defense=stats_dict["special-defense"],
-                         speed=stats_dict["speed"])
+    stats = PokemonBasic(hp=hp, attack=attack, defense=defense,
+                         special_attack=special_attack, special_defense=special_defense, speed=speed)
 
-    return PokemonInfo(name=raw["name"], id=raw["id"], types=types, abilities=abilities,
-                       height_meters=raw["height"] / 10, weight_kg=raw["weight"] / 10, stats=stats)
+    return PokemonInfo(name=pokemon.name, id=pokemon.id, types=list(pokemon.types), abilities=list(pokemon.abilities),
+                       height_meters=pokemon.height / 10, weight_kg=pokemon.weight / 10, stats=stats)
 
-def transform_pokemon_moves(raw: dict) -> PokemonMoveList:
+def transform_pokemon_moves(raw: PokemonRecord | dict) -> PokemonMoveList:
     """
     It transforms the info of a pokemon to PokemonMoveList, collecting only the moves.
     Also, it cuts out different versions of the moves.
     """
-    moves = [m["move"]["name"] for m in raw["moves"]]
-    return PokemonMoveList(pokemon_name=raw["name"], total_moves=len(moves),moves=moves) 
+    pokemon = raw if isinstance(raw, PokemonRecord) else project_pokemon(raw)
+    return PokemonMoveList(pokemon_name=pokemon.name, total_moves=len(pokemon.moves), moves=list(pokemon.moves))
 
-def transform_move_info(raw: dict) -> Move:
+def transform_move_info(raw: MoveRecord | dict) -> Move:
     """
     It transforms info of a move into a Move object.
     """
-    effect = "No description available."
-    for entry in raw.get("effect_entries", []):
-        if entry["language"]["name"] == "en":
-            effect = entry.get("effect", effect)  # We are using only the full effect 
-            break
-    
-    return Move(name=raw["name"], type=raw["type"]["name"], power=raw["power"],
-                accuracy=raw["accuracy"], pp=raw["pp"],damage_class=raw["damage_class"]["name"], effect=effect)
+    move = raw if isinstance(raw, MoveRecord) else project_move(raw)
+    return Move(name=move.name, type=move.type, power=move.power, accuracy=move.accuracy, pp=move.pp,
+                damage_class=move.damage_class, effect=move.effect)
 
-def transform_type_effectiveness(raw: dict) -> TypeEffectiveness:
+def transform_type_effectiveness(raw: TypeRecord | dict) -> TypeEffectiveness:
     """
     It takes all the damage relations and trasnforms the response into a TypeEffectivness object.
     """
-    relations = raw["damage_relations"]
-    return TypeEffectiveness(name=raw["name"],
-                             double_damage_to=[t["name"] for t in relations["double_damage_to"]],
-                             half_damage_to=[t["name"] for t in relations["half_damage_to"]], no_damage_to=[t["name"] for t in relations["no_damage_to"]],
-                             double_damage_from=[t["name"] for t in relations["double_damage_from"]],
-                             half_damage_from=[t["name"] for t in relations["half_damage_from"]],
-                             no_damage_from=[t["name"] for t in relations["no_damage_from"]])
+    type_record = raw if isinstance(raw, TypeRecord) else project_type(raw)
+    return TypeEffectiveness(name=type_record.name,
+                             **{relation: list(getattr(type_record, relation)) for relation in damage_relations})
 
-def transform_ability_info(raw: dict) -> Ability:
+def transform_ability_info(raw: AbilityRecord | dict) -> Ability:
     """
     It takes an ability response from the endpoint and 
     gives out an Ability object with its name, the effect descriptions and a list of Pokemon that have it.
     """
+    ability = raw if isinstance(raw, AbilityRecord) else project_ability(raw)
+    return Ability(name=ability.name, effect=ability.effect, pokemon_with_ability=list(ability.pokemon[:10]))
 
-    effect = "No description available."
-    for entry in raw.get("effect_entries", []):
-        if entry["language"]["name"] == "en":
-            effect = entry.get("effect", effect) # We are skipping the short effect
-            break
+def transform_matchups(attacking_types: list[str], defending_types: list[str], multipliers) -> MatchupTable:
+    """
+    It turns the multiplier matrix (attacking types x defenders) into a list of matchups.
+    """
+    return MatchupTable(matchups=[Matchup(attacking=attacking.lower().strip(), defending=defending.lower().strip(),
+                                          multiplier=float(multipliers[i][j]))
+                                  for i, attacking in enumerate(attacking_types)
+                                  for j, defending in enumerate(defending_types)])
 
-    pokemon_list = [pokemon["pokemon"]["name"] for pokemon in raw.get("pokemon", [])[:10]]
-    return Ability(name=raw["name"], effect=effect, pokemon_with_ability=pokemon_list)
\ No newline at end of file
+def transform_pokemon_page(name: str, pokemon: tuple[str, ...], limit: int, offset: int) -> PokemonPage:
+    """
+    It cuts one page out of a list of Pokemon names.
+    """
+    return PokemonPage(name=name, total=len(pokemon), offset=offset, pokemon=list(pokemon[offset:offset + limit]))
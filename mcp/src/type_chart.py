@@ -0,0 +1,80 @@
+"""
+Type effectiveness chart.
+
+The 18x18 matrix of damage multipliers (rows are attacking types, columns defending types) is built once
+from the /type data fetched through the client. A matchup between any number of attacking types and
+(dual-type) defenders is then a single vectorized NumPy operation instead of several get_type calls.
+"""
+
+import asyncio
+import numpy as np
+from .client import pokeapi_client
+from .projections import TypeRecord
+
+type_names = ("normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+              "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy")
+type_index = {name: i for i, name in enumerate(type_names)}
+# Extra row and column of ones standing for "no type", the second type of single-type defenders
+no_type = len(type_names)
+
+def build_matrix(records: list[TypeRecord]) -> np.ndarray:
+    """
+    It builds the multiplier matrix from the damage relations of the attacking types.
+    Types without a record keep neutral (1x) multipliers.
+    """
+    matrix = np.ones((no_type + 1, no_type + 1))
+    for record in records:
+        row = type_index.get(record.name)
+        if row is None:
+            continue
+        for multiplier, targets in ((2.0, record.double_damage_to), (0.5, record.half_damage_to),
+                                    (0.0, record.no_damage_to)):
+            for target in targets:
+                if target in type_index:
+                    matrix[row, type_index[target]] = multiplier
+    return matrix
+
+def _index(name: str) -> int:
+    key = name.lower().strip()
+    if key not in type_index:
+        raise ValueError(f"Type '{key}' not found")
+    return type_index[key]
+
+def compute_matchups(matrix: np.ndarray, attacking_types: list[str], defending_types: list[str]) -> np.ndarray:
+    """
+    It returns the multipliers of every attacking type (rows) against every defender (columns).
+    A dual-type defender is written as "water/ground".
+    """
+    if not attacking_types or not defending_types:
+        raise ValueError("At least one attacking type and one defender are needed")
+    attackers = np.array([_index(name) for name in attacking_types], dtype=int)
+    defenders = np.full((len(defending_types), 2), no_type)
+    for i, defender in enumerate(defending_types):
+        types = [_index(name) for name in defender.split("/") if name.strip()]
+        if not 1 <= len(types) <= 2:
+            raise ValueError(f"Defender '{defender}' must have one or two types")
+        defenders[i, :len(types)] = types
+
+    rows = attackers[:, None]
+    return matrix[rows, defenders[:, 0]] * matrix[rows, defenders[:, 1]]
+
+class TypeChart:
+    """
+    It builds the matrix on first use and keeps it, since type relations don't change.
+    """
+    def __init__(self):
+        self.matrix: np.ndarray | None = None
+        self.lock = asyncio.Lock()
+
+    async def get_matrix(self) -> np.ndarray:
+        if self.matrix is None:
+            async with self.lock:
+                if self.matrix is None:
+                    records = await asyncio.gather(*[pokeapi_client.get_type_raw(name) for name in type_names])
+                    self.matrix = build_matrix(list(records))
+        return self.matrix
+
+    async def matchups(self, attacking_types: list[str], defending_types: list[str]) -> np.ndarray:
+        return compute_matchups(await self.get_matrix(), attacking_types, defending_types)
+
+type_chart = TypeChart()
@@ -0,0 +1,46 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import pokeapi_client
+from src.tools import batch_max, get_pokemon_batch
+
+def test():
+    with open(api_samples / "raw_pokemon.json") as f:
+        raw = json.load(f)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/pikachu"):
+            return httpx.Response(200, json=raw)
+        return httpx.Response(404)
+
+    async def run():
+        pokeapi_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = json.loads(await get_pokemon_batch(["pikachu", "missingno", "PIKACHU"]))
+        too_many = json.loads(await get_pokemon_batch(["pikachu"] * batch_max + ["raichu", "pichu"]))
+        await pokeapi_client.stop()
+        return result, too_many
+
+    result, too_many = asyncio.run(run())
+    results = result["results"]
+
+    assert [r["name"] for r in results] == ["pikachu", "missingno", "pikachu"]
+    assert "error" in results[1]
+    assert results[2]["types"] == ["electric"]
+    assert "skipped" not in result
+    # Names past batch_max are reported instead of silently dropped
+    assert len(too_many["results"]) == batch_max
+    assert too_many["skipped"] == ["raichu", "pichu"]
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,43 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+sys.path.insert(0, str(file_path ))
+
+from src.cache import LRUCache, estimate_size
+
+def test():
+    item = {"name": "pikachu", "types": ["electric"]}
+    size = estimate_size(item)
+    cache = LRUCache(max_bytes=size * 2, ttl=60)
+
+    cache.put("pikachu", item)
+    cache.put("raichu", dict(item, name="raichu"))
+    assert cache.get("pikachu") is not None  # pikachu is now the most recently used
+
+    cache.put("pichu", dict(item, name="pichu"))
+
+    assert "raichu" not in cache
+    assert "pikachu" in cache and "pichu" in cache
+    assert cache.size <= cache.max_bytes
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 1
+
+    print("All test passed")
+
+def test_expired_entries_are_misses():
+    cache = LRUCache(max_bytes=10_000, ttl=60)
+    cache.put("electric", {"name": "electric"}, fetched_at=datetime.now() - timedelta(minutes=5))
+
+    assert cache.get("electric") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.size == 0
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_expired_entries_are_misses()
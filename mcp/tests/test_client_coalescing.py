@@ -0,0 +1,68 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+
+def make_client(handler) -> PokeAPIClient:
+    client = PokeAPIClient()
+    client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def test():
+    with open(api_samples / "raw_pokemon.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=raw)
+
+    async def run():
+        client = make_client(handler)
+        results = await asyncio.gather(*[client.get_pokemon_raw(" Pikachu") for _ in range(50)])
+        await client.stop()
+        return client, results
+
+    client, results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(r.name == "pikachu" for r in results)
+    assert client.upstream_fetches == 1
+    assert client.coalesced_fetches == 49
+    assert client.in_flight == {}
+
+    print("All test passed")
+
+def test_errors_reach_every_waiter():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(404)
+
+    async def run():
+        client = make_client(handler)
+        results = await asyncio.gather(*[client.get_move_raw("bad move") for _ in range(5)],
+                                       return_exceptions=True)
+        await client.stop()
+        return client, results
+
+    client, results = asyncio.run(run())
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert client.upstream_fetches == 1
+    assert client.in_flight == {}
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_errors_reach_every_waiter()
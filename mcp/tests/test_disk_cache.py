@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+from src.disk_cache import DiskCache
+
+def test():
+    with open(api_samples / "raw_move.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=raw)
+
+    async def run(cache_path: str):
+        # First server run fetches from the API and writes behind to disk on stop
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.start(cache_path)
+        await client.get_move_raw("thunderbolt")
+        await client.stop()
+
+        # Second run starts warm from disk and never goes upstream
+        restarted = PokeAPIClient()
+        restarted.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await restarted.start(cache_path)
+        assert "thunderbolt" in restarted.move_cache
+        data = await restarted.get_move_raw("thunderbolt")
+        await restarted.stop()
+        return data
+
+    with tempfile.TemporaryDirectory() as directory:
+        data = asyncio.run(run(str(Path(directory) / "cache.db")))
+
+    assert data.name == "thunderbolt"
+    assert len(calls) == 1
+
+    print("All test passed")
+
+def test_failed_flush_keeps_entries():
+    async def run(cache_path: str):
+        cache = DiskCache(cache_path)
+        await cache.open()
+        write = cache._write
+        cache.put("type", "electric", {"name": "electric", "version": 1}, datetime.now())
+        cache.put("type", "water", {"name": "water"}, datetime.now())
+
+        def locked(batch):
+            # Another worker holds the lock past busy_timeout, and electric is queued again meanwhile
+            cache.put("type", "electric", {"name": "electric", "version": 2}, datetime.now())
+            raise sqlite3.OperationalError("database is locked")
+
+        cache._write = locked
+        try:
+            await cache.flush()
+        except sqlite3.OperationalError:
+            pass
+        cache._write = write
+        await cache.flush()
+        stored = await cache.get("type", "electric"), await cache.get("type", "water")
+
+        # A failing last flush doesn't stop the shutdown, the database is still closed
+        cache.put("type", "fire", {"name": "fire"}, datetime.now())
+        cache._write = locked
+        await cache.close()
+        assert cache.db is None
+        return stored
+
+    with tempfile.TemporaryDirectory() as directory:
+        electric, water = asyncio.run(run(str(Path(directory) / "cache.db")))
+
+    assert electric[0]["version"] == 2
+    assert water[0]["name"] == "water"
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_failed_flush_keeps_entries()
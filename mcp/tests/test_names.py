@@ -0,0 +1,112 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient, NotFoundError
+from src.names import NameIndex
+
+def test():
+    index = NameIndex(["charizard", "charmander", "charmeleon", "thunderbolt", "thunder", "mr-mime"])
+
+    assert index.resolve("thunder bolt") == "thunderbolt"
+    assert index.resolve("mr mime") == "mr-mime"
+    assert index.resolve("charzard") is None
+    assert index.suggest("charzard")[0] == "charizard"
+    assert index.suggest("xyz") == []
+
+    print("All test passed")
+
+def test_client_resolves_before_fetching():
+    with open(api_samples / "raw_move.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/move"):
+            offset = int(request.url.params["offset"])
+            names = ["thunderbolt", "thunder", "thunder-punch"][offset:offset + 2]
+            return httpx.Response(200, json={"count": 3, "results": [{"name": name} for name in names]})
+        if request.url.path.endswith("/thunderbolt"):
+            return httpx.Response(200, json=raw)
+        return httpx.Response(404)
+
+    async def run():
+        client = PokeAPIClient()
+        client.listing_page_size = 2
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.load_name_indexes()
+        move = await client.get_move_raw("Thunder Bolt")
+        try:
+            await client.get_move_raw("thunderblot")
+            error = None
+        except NotFoundError as e:
+            error = e
+        await client.stop()
+        return client, move, error
+
+    client, move, error = asyncio.run(run())
+
+    assert move.name == "thunderbolt"
+    assert error.suggestions[0] == "thunderbolt"
+    assert "Did you mean" in str(error)
+    assert client.names_rejected == 1
+    assert len(client.name_indexes["move"]) == 3
+    # Two listing pages plus a single fetch: the misspelled name never went upstream
+    assert calls.count("/api/v2/move/thunderbolt") == 1
+    assert not any("thunderblot" in call for call in calls)
+
+    print("All test passed")
+
+def test_indexes_reloaded():
+    listing = {"available": False, "names": ["thunderbolt"]}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/move") and listing["available"]:
+            names = listing["names"]
+            return httpx.Response(200, json={"count": len(names), "results": [{"name": name} for name in names]})
+        return httpx.Response(503)
+
+    async def run():
+        client = PokeAPIClient()
+        client.max_retries = 0
+        client.name_index_retry = 0
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.load_name_indexes()
+        failed = "move" in client.name_indexes
+
+        # The failed load is tried again on the next lookup
+        listing["available"] = True
+        client._resolve_name("move", "Move", "thunderbolt")
+        await asyncio.gather(*client.background_tasks)
+        first = len(client.name_indexes["move"])
+
+        # A move added upstream is found once the index is older than its ttl
+        listing["names"] = ["thunderbolt", "brand-new"]
+        client.name_index_ttl = 0
+        client._resolve_name("move", "Move", "thunderbolt")
+        await asyncio.gather(*client.background_tasks)
+        name = client._resolve_name("move", "Move", "brand new")
+        await client.stop()
+        return failed, first, name
+
+    failed, first, name = asyncio.run(run())
+
+    assert not failed
+    assert first == 1
+    assert name == "brand-new"
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_client_resolves_before_fetching()
+    test_indexes_reloaded()
@@ -0,0 +1,43 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient, NotFoundError
+
+def test():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(404)
+
+    async def run():
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        errors = []
+        for _ in range(100):
+            try:
+                await client.get_pokemon_raw("missingno")
+            except NotFoundError as e:
+                errors.append(e)
+        stats = client.get_stats()
+        await client.stop()
+        return errors, stats
+
+    errors, stats = asyncio.run(run())
+
+    assert len(errors) == 100
+    assert all("missingno" in str(e) for e in errors)
+    assert len(calls) == 1
+    assert stats["not_found_caches"]["pokemon"]["hits"] == 99
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
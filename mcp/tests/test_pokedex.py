@@ -0,0 +1,76 @@
+import asyncio
+import json
+from pathlib import Path
+import sys
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+sys.path.insert(0, str(file_path))
+
+from src.client import PokeAPIClient, pokeapi_client
+from src.pokedex import Pokedex
+from src.tools import list_pokemon
+
+def listing(count: int) -> list[dict]:
+    names = ["bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard", "squirtle"]
+    return [{"name": names[i % len(names)] if i < len(names) else f"pokemon-{i + 1}",
+             "url": f"https://pokeapi.co/api/v2/pokemon/{i + 1}/"} for i in range(count)]
+
+def test():
+    pokedex = Pokedex.from_listing(listing(30))
+
+    total, page = pokedex.page(limit=2, offset=0, prefix="Char")
+    assert total == 3
+    assert [entry.name for entry in page] == ["charmander", "charmeleon"]
+
+    total, page = pokedex.page(limit=5, offset=2, min_id=10, max_id=20)
+    assert total == 11
+    assert [entry.id for entry in page] == [12, 13, 14, 15, 16]
+
+    total, page = pokedex.page(limit=5, offset=100)
+    assert total == 30
+    assert page == []
+
+    print("All test passed")
+
+def test_client_lists_from_memory():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(200, json={"count": 1300, "results": listing(1300)[offset:offset + limit]})
+
+    async def run():
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        first = await client.list_pokemon(limit=1000)
+        squirtle = await client.list_pokemon(prefix="squirt")
+        last = await client.list_pokemon(limit=50, min_id=1290)
+        await client.stop()
+        fetched = len(calls)
+
+        # A negative offset is clamped to 0, the next page starts right after the first one
+        pokeapi_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        page = json.loads(await list_pokemon(limit=20, offset=-5))
+        await pokeapi_client.stop()
+        return first, squirtle, last, page, fetched
+
+    first, squirtle, last, page, fetched = asyncio.run(run())
+
+    assert first["count"] == 1300
+    assert len(first["results"]) == 1000
+    assert squirtle["results"] == [{"name": "squirtle", "id": 7}]
+    assert [item["id"] for item in last["results"]] == list(range(1290, 1301))
+    # Three concurrent pages for the whole listing, then everything is answered from memory
+    assert fetched == 3
+    assert page["pokemon"][0] == "bulbasaur"
+    assert page["next_offset"] == 20
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_client_lists_from_memory()
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+
+def test():
+    samples = {}
+    for resource in ("pokemon", "type", "ability"):
+        with open(api_samples / f"raw_{resource}.json") as f:
+            samples[resource] = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        resource, name = request.url.path.split("/")[-2:]
+        raw = dict(samples[resource], name=name)
+        return httpx.Response(200, json=raw)
+
+    async def run():
+        client = PokeAPIClient()
+        client.prefetch = True
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pokemon = await client.get_pokemon_raw(samples["pokemon"]["name"])
+        await asyncio.gather(*client.background_tasks)
+        fetched = len(calls)
+        types = [await client.get_type_raw(name) for name in pokemon.types]
+        abilities = [await client.get_ability_raw(name) for name in pokemon.abilities]
+        stats = client.get_stats()
+        await client.stop()
+        return pokemon, types, abilities, fetched, stats
+
+    pokemon, types, abilities, fetched, stats = asyncio.run(run())
+
+    related = len(pokemon.types) + len(pokemon.abilities)
+    assert [record.name for record in types] == list(pokemon.types)
+    assert [record.name for record in abilities] == list(pokemon.abilities)
+    # The Pokemon and its related resources were fetched once, the later lookups were all prefetch hits
+    assert fetched == 1 + related
+    assert stats["upstream_fetches"] == 1 + related
+    assert stats["prefetches"] == related
+    assert stats["caches"]["type"]["prefetch_hits"] == len(pokemon.types)
+    assert stats["caches"]["ability"]["prefetch_hits"] == len(pokemon.abilities)
+
+    print("All test passed")
+
+def test_prefetch_skipped_when_circuit_open():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        with open(api_samples / "raw_pokemon.json") as f:
+            return httpx.Response(200, json=json.load(f))
+
+    async def run():
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pokemon = await client.get_pokemon_raw("pikachu")
+        client.prefetch = True
+        client.breaker.failures = client.breaker.failure_threshold - 1
+        client.breaker.record_failure()
+        client._schedule_prefetch("pokemon", pokemon)
+        stats = client.get_stats()
+        await client.stop()
+        return pokemon, stats
+
+    pokemon, stats = asyncio.run(run())
+
+    assert stats["prefetches_skipped"] == len(pokemon.types) + len(pokemon.abilities)
+    assert not stats["in_flight"]
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_prefetch_skipped_when_circuit_open()
@@ -0,0 +1,29 @@
+import json
+import sys
+from pathlib import Path
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.cache import estimate_size
+from src.projections import to_record
+from src.transformers import transform_pokemon_info, transform_pokemon_moves
+
+def test():
+    with open(api_samples / "raw_pokemon.json") as f:
+        raw = json.load(f)
+
+    record = to_record("pokemon", raw)
+
+    assert transform_pokemon_info(record) == transform_pokemon_info(raw)
+    assert transform_pokemon_moves(record) == transform_pokemon_moves(raw)
+    assert estimate_size(record) * 50 < estimate_size(raw)
+    # Records are stored as JSON lists on disk and must come back identical
+    assert to_record("pokemon", json.loads(json.dumps(record))) == record
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+from src.resilience import (AdaptiveLimiter, CircuitBreaker, CircuitOpenError, UpstreamBusyError, UpstreamTimeoutError,
+                            retry_delay)
+
+def test():
+    assert retry_delay(0, "2") == 2.0
+    assert retry_delay(0, "120") == 120.0
+    assert 0 <= retry_delay(3, None) <= 0.8
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state != "closed"
+    # Half open right away with no reset timeout: one probe, then closed again when it succeeds
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+    async def adapt():
+        limiter = AdaptiveLimiter(initial=8)
+        await limiter.acquire()
+        await limiter.release(0.1, overloaded=True)
+        halved = limiter.limit
+        await limiter.acquire()
+        await limiter.release(0.1, overloaded=False)
+        return halved, limiter.limit
+
+    halved, grown = asyncio.run(adapt())
+    assert halved == 4
+    assert grown == 4.25
+
+    breaker.trip(120)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    print("All test passed")
+
+def test_client_retries_and_fails_fast():
+    with open(api_samples / "raw_ability.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/static") and calls.count(request.url.path) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if request.url.path.endswith("/static"):
+            return httpx.Response(200, json=raw)
+        return httpx.Response(503)
+
+    async def run():
+        client = PokeAPIClient()
+        client.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        ability = await client.get_ability_raw("static")
+        errors = []
+        for name in ("levitate", "overgrow"):
+            try:
+                await client.get_ability_raw(name)
+            except ValueError as e:
+                errors.append(e)
+        await client.stop()
+        return client, ability, errors
+
+    client, ability, errors = asyncio.run(run())
+
+    assert ability.name == "static"
+    # 1 throttled + 1 retried for static, 3 failing attempts for levitate, overgrow never sent
+    assert len(calls) == 5
+    assert client.retries == 3
+    assert "503" in str(errors[0])
+    assert isinstance(errors[1], CircuitOpenError)
+
+    print("All test passed")
+
+def test_hedged_request():
+    with open(api_samples / "raw_type.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=raw)
+
+    async def run():
+        client = PokeAPIClient()
+        client.hedge_after = 0.05
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        start = asyncio.get_running_loop().time()
+        record = await client.get_type_raw("electric")
+        elapsed = asyncio.get_running_loop().time() - start
+        await client.stop()
+        return client, record, elapsed
+
+    client, record, elapsed = asyncio.run(run())
+
+    assert record.name == "electric"
+    assert client.hedged_requests == 1
+    assert elapsed < 1
+
+    print("All test passed")
+
+def test_request_budget():
+    calls = []
+
+    async def stalled(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(60)
+
+    async def read_timeout(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    async def run(handler):
+        client = PokeAPIClient()
+        client.request_budget = 0.3
+        client.hedge_after = 0
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        start = asyncio.get_running_loop().time()
+        try:
+            await client.get_type_raw("electric")
+        except (httpx.HTTPError, ValueError) as e:
+            error = e
+        elapsed = asyncio.get_running_loop().time() - start
+        await client.stop()
+        return client, error, elapsed
+
+    # A stalled upstream costs the budget, not the read timeout of every attempt
+    client, error, elapsed = asyncio.run(run(stalled))
+    assert isinstance(error, UpstreamTimeoutError)
+    assert elapsed < 1
+    assert len(calls) == 1
+
+    # A read timeout is not retried when another full read timeout would not fit in the budget
+    calls.clear()
+    client, error, elapsed = asyncio.run(run(read_timeout))
+    assert isinstance(error, httpx.ReadTimeout)
+    assert client.retries == 0
+    assert len(calls) == 1
+
+    print("All test passed")
+
+def test_long_retry_after():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(429, headers={"Retry-After": "120"})
+
+    async def run():
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        errors = []
+        for name in ("electric", "water"):
+            try:
+                await client.get_type_raw(name)
+            except ValueError as e:
+                errors.append(e)
+        await client.stop()
+        return client, errors
+
+    client, errors = asyncio.run(run())
+
+    # Not retried before the 120 s asked for, and nothing else is sent meanwhile
+    assert len(calls) == 1
+    assert client.retries == 0
+    assert "429" in str(errors[0])
+    assert isinstance(errors[1], CircuitOpenError)
+    assert client.breaker.state == "open"
+
+    print("All test passed")
+
+def test_queued_requests_are_not_upstream_failures():
+    with open(api_samples / "raw_type.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        # Slow but healthy: every request succeeds
+        calls.append(request.url.path)
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={**raw, "name": request.url.path.rsplit("/", 1)[-1]})
+
+    async def run():
+        client = PokeAPIClient()
+        client.request_budget = 0.5
+        client.hedge_after = 0
+        client.limiter = AdaptiveLimiter(initial=2, minimum=2)
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(slow))
+        results = await asyncio.gather(*[client.get_type_raw(f"type-{i}") for i in range(20)], return_exceptions=True)
+        state = client.breaker.state
+        after = await client.get_type_raw("electric")
+        await client.stop()
+        return client, results, state, after
+
+    client, results, state, after = asyncio.run(run())
+
+    busy = [result for result in results if isinstance(result, UpstreamBusyError)]
+    # Requests still queued when the budget ran out were never sent and are reported as local overload
+    assert busy and client.queue_timeouts == len(busy)
+    assert len(calls) == len(results) - len(busy) + 1
+    # Queueing is not an upstream failure, the circuit stays closed for the next lookup
+    assert state == "closed"
+    assert after.name == "electric"
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_client_retries_and_fails_fast()
+    test_hedged_request()
+    test_request_budget()
+    test_long_retry_after()
+    test_queued_requests_are_not_upstream_failures()
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+
+def test():
+    with open(api_samples / "raw_type.json") as f:
+        raw = json.load(f)
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=raw, headers={"ETag": '"v1"'})
+
+    async def run():
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        # Every entry is stale as soon as it is stored
+        client.type_cache.ttl = -1
+        first = await client.get_type_raw("electric")
+        second = await client.get_type_raw("electric")
+        # The stale entry was served without waiting, the revalidation runs in the background
+        assert len(requests) == 1
+        await asyncio.gather(*client.background_tasks)
+        stats = client.get_stats()
+        await client.stop()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(run())
+
+    assert second is first
+    assert len(requests) == 2
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    assert stats["revalidations"] == 1 and stats["not_modified"] == 1
+    assert stats["caches"]["type"]["stale_hits"] == 1
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
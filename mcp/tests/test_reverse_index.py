@@ -0,0 +1,50 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import pokeapi_client
+from src.tools import get_move_learners, get_type_pokemon
+
+def test():
+    samples = {}
+    for resource, sample in [("move", "raw_move"), ("type", "raw_type")]:
+        with open(api_samples / f"{sample}.json") as f:
+            samples[resource] = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        resource = request.url.path.split("/")[-2]
+        return httpx.Response(200, json=samples[resource])
+
+    async def run():
+        pokeapi_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        first = json.loads(await get_move_learners("Thunderbolt", limit=10))
+        second = json.loads(await get_move_learners("thunderbolt", limit=10, offset=340))
+        electric = json.loads(await get_type_pokemon("electric", limit=500))
+        await pokeapi_client.stop()
+        return first, second, electric
+
+    first, second, electric = asyncio.run(run())
+
+    assert first["name"] == "thunderbolt"
+    assert first["total"] == len(samples["move"]["learned_by_pokemon"])
+    assert len(first["pokemon"]) == 10
+    assert len(second["pokemon"]) == first["total"] - 340
+    assert "pikachu" in electric["pokemon"]
+    assert len(electric["pokemon"]) == min(electric["total"], 200)
+    # The second move query is answered by the index
+    assert len(calls) == 2
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import redis.asyncio as redis
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+from src.redis_cache import RedisCache
+
+class StubRedis:
+    """
+    In-memory stand-in for the few redis.asyncio calls RedisCache makes, shared by several caches like one server.
+    """
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.rankings: dict[str, dict[str, float]] = {}
+        self.down = False
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return value.encode() if value is not None else None
+
+    async def mget(self, keys):
+        return [await self.get(key) for key in keys]
+
+    async def zrevrange(self, key, start, end):
+        ranking = sorted(self.rankings.get(key, {}).items(), key=lambda item: item[1], reverse=True)
+        return [name.encode() for name, _ in ranking[start:end + 1]]
+
+    def pipeline(self, transaction=True):
+        return StubPipeline(self)
+
+    async def aclose(self):
+        pass
+
+class StubPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append(lambda: self.redis.values.__setitem__(key, value))
+
+    def zadd(self, key, scores):
+        self.commands.append(lambda: self.redis.rankings.setdefault(key, {}).update(scores))
+
+    def zremrangebyrank(self, key, start, end):
+        pass
+
+    async def execute(self):
+        if self.redis.down:
+            raise redis.ConnectionError("Connection refused")
+        for command in self.commands:
+            command()
+
+def test():
+    with open(api_samples / "raw_type.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=raw)
+
+    async def worker(cache_path: str) -> PokeAPIClient:
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.start(cache_path)
+        return client
+
+    async def run(cache_path: str):
+        # Two workers of the same host sharing one cache file, both running at the same time
+        first, second = await worker(cache_path), await worker(cache_path)
+        await first.get_type_raw("electric")
+        await first.shared_cache.flush()
+        electric = await second.get_type_raw("electric")
+
+        # A stale near entry is refreshed from the copy another worker already renewed
+        entry = second.type_cache.entries["electric"]
+        entry.fetched_at = datetime.now() - timedelta(days=30)
+        second._revalidate_if_stale(second.type_cache, "type", "Type", "electric", entry)
+        await asyncio.gather(*second.background_tasks)
+        refreshed = second.type_cache.entries["electric"]
+
+        await first.stop()
+        await second.stop()
+        return electric, refreshed, second
+
+    with tempfile.TemporaryDirectory() as directory:
+        electric, refreshed, second = asyncio.run(run(str(Path(directory) / "cache.db")))
+
+    assert electric.name == "electric"
+    assert not second.type_cache.is_expired(refreshed.fetched_at)
+    assert second.shared_hits == 2
+    assert second.upstream_fetches == 0
+    # Only the first worker went upstream
+    assert len(calls) == 1
+
+    print("All test passed")
+
+def test_redis():
+    with open(api_samples / "raw_type.json") as f:
+        raw = json.load(f)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=raw)
+
+    def replica(server: StubRedis) -> PokeAPIClient:
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client.shared_cache = RedisCache("redis://stub")
+        client.shared_cache.redis = server
+        return client
+
+    async def run():
+        server = StubRedis()
+        first, second = replica(server), replica(server)
+        await first.get_type_raw("electric")
+        # A failed flush keeps the batch for the next one
+        server.down = True
+        try:
+            await first.shared_cache.flush()
+        except redis.ConnectionError:
+            pass
+        server.down = False
+        await first.shared_cache.flush()
+        electric = await second.get_type_raw("electric")
+        recent = await second.shared_cache.load_recent("type", 10)
+        # Redis down on shutdown: the pending entries are lost but the server still stops cleanly
+        await second.get_type_raw("water")
+        server.down = True
+        shared_cache = second.shared_cache
+        await first.stop()
+        await second.stop()
+        assert shared_cache.redis is None and not shared_cache.pending
+
+        # Redis down on startup: the server starts with its memory caches only
+        unreachable = PokeAPIClient()
+        await unreachable.start(cache_redis_url="redis://127.0.0.1:1/0")
+        return electric, recent, second, unreachable
+
+    electric, recent, second, unreachable = asyncio.run(run())
+
+    assert electric.name == "electric"
+    assert [name for name, _, _ in recent] == ["electric"]
+    assert second.shared_hits == 1
+    assert calls == ["/api/v2/type/electric", "/api/v2/type/water"]
+    assert unreachable.shared_cache is None
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_redis()
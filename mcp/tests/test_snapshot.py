@@ -0,0 +1,66 @@
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.client import PokeAPIClient
+from src.projections import to_record
+from src.snapshot import Snapshot, SnapshotWriter
+
+def write_snapshot(path: str) -> None:
+    writer = SnapshotWriter(path)
+    for resource, sample in [("pokemon", "raw_pokemon"), ("move", "raw_move"),
+                             ("type", "raw_type"), ("ability", "raw_ability")]:
+        with open(api_samples / f"{sample}.json") as f:
+            raw = json.load(f)
+            writer.add(resource, to_record(resource, raw), raw["id"])
+    writer.close()
+
+def test():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("Offline mode must not call the API")
+
+    async def run(snapshot_path: str):
+        client = PokeAPIClient()
+        client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.start(snapshot_path=snapshot_path)
+        pokemon = await client.get_pokemon_raw("Pikachu")
+        by_id = await client.get_pokemon_raw("25")
+        ability = await client.get_ability_raw("static")
+        listing = await client.list_pokemon()
+        try:
+            await client.get_move_raw("splash")
+            missing = None
+        except ValueError as e:
+            missing = e
+        await client.stop()
+        return pokemon, by_id, ability, listing, missing
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = str(Path(directory) / "pokedex.snap")
+        write_snapshot(snapshot_path)
+
+        snapshot = Snapshot(snapshot_path)
+        assert snapshot.names("move") == ["thunderbolt"]
+        snapshot.close()
+
+        pokemon, by_id, ability, listing, missing = asyncio.run(run(snapshot_path))
+
+    assert pokemon.name == "pikachu" and pokemon.id == 25
+    assert by_id == pokemon
+    assert ability.name == "static"
+    assert [item["name"] for item in listing["results"]] == ["pikachu"]
+    assert "not found" in str(missing)
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,53 @@
+import json
+import sys
+from pathlib import Path
+
+tests_directory = Path(__file__).parent
+file_path = tests_directory.parent
+api_samples = file_path .parent / "api_samples"
+sys.path.insert(0, str(file_path ))
+
+from src.projections import to_record
+from src.transformers import transform_matchups
+from src.type_chart import build_matrix, compute_matchups
+
+def test():
+    with open(api_samples / "raw_type.json") as f:
+        electric = to_record("type", json.load(f))
+
+    matrix = build_matrix([electric])
+    defenders = ["water", "ground", "water/flying", "grass/dragon", "fire"]
+    multipliers = compute_matchups(matrix, ["Electric", "fire"], defenders)
+
+    assert multipliers.shape == (2, 5)
+    assert list(multipliers[0]) == [2.0, 0.0, 4.0, 0.25, 1.0]
+    # No record was given for fire, so it stays neutral
+    assert list(multipliers[1]) == [1.0] * 5
+
+    table = transform_matchups(["Electric", "fire"], defenders, multipliers)
+    assert table.matchups[2].attacking == "electric"
+    assert table.matchups[2].defending == "water/flying"
+    assert table.matchups[2].multiplier == 4.0
+
+    print("All test passed")
+
+def test_unknown_type():
+    matrix = build_matrix([])
+    try:
+        compute_matchups(matrix, ["electric"], ["lightning"])
+        assert False, "Expected ValueError"
+    except ValueError as e:
+        assert "lightning" in str(e)
+
+    for attacking, defending in (([], ["water"]), (["electric"], [])):
+        try:
+            compute_matchups(matrix, attacking, defending)
+            assert False, "Expected ValueError"
+        except ValueError as e:
+            assert "At least one" in str(e)
+
+    print("All test passed")
+
+if __name__ == "__main__":
+    test()
+    test_unknown_type()